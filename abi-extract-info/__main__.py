@@ -5,11 +5,19 @@
 # This source code is licensed under the GPL-3.0 license found in
 # the LICENSE file in the root directory of this source tree.
 
+import os
+import random
+
+import artifactCache
 import compilationDriver
+import resultCache
+import runArchive
 import reportDriver
 import optionParser
 import helper
+import scheduler
 import targetArch
+import traceRecorder
 
 from analyzers.datatypes import DataTypesAnalyzer
 from analyzers.saved import SavedAnalyzer
@@ -36,9 +44,13 @@ ANALYZERS = [
 ]
 
 
-def run_analyzers(Driver, Report, Target):
-    for analyzer in ANALYZERS:
-        analyzer(Driver, Report, Target).run()
+# Independent analyzers run concurrently (up to `jobs`), the report sections
+# are still appended in the order of `ANALYZERS`.
+def run_analyzers(Driver, Report, Target, jobs=1):
+    analyzers = [analyzer(Driver, Report, Target) for analyzer in ANALYZERS]
+    for summary_file in scheduler.Scheduler(analyzers, jobs).run():
+        if summary_file is not None:
+            Report.append(summary_file)
 
 
 if __name__ == "__main__":
@@ -62,11 +74,66 @@ if __name__ == "__main__":
 
     is_verbose = OptionParser.get("verbose")
     cc_path, sim_path = helper.get_cc_sim_paths(cc_option, sim_option)
-    Driver = compilationDriver.CompilationDriver(is_verbose, cc_path, sim_path)
+    Cache = None
+    Results = None
+    if OptionParser.get("cache_dir"):
+        Cache = artifactCache.ArtifactCache(
+            OptionParser.get("cache_dir"),
+            OptionParser.get("cache_size") * 1024 * 1024,
+        )
+        # The analyzer results are small, they are not counted in the size
+        # of the artifacts.
+        Results = resultCache.ResultCache(
+            artifactCache.ArtifactCache(
+                os.path.join(OptionParser.get("cache_dir"), "results"),
+                OptionParser.get("cache_size") * 1024 * 1024,
+            ),
+            OptionParser.get("rerun"),
+        )
+    # Replay the runs of a recorded archive, or record them. The values of
+    # the tests must be generated the same way, from the recorded seed.
+    seed = OptionParser.get("seed")
+    Archive = None
+    if OptionParser.get("replay"):
+        try:
+            Archive = runArchive.RunArchive.load(OptionParser.get("replay"))
+        except runArchive.RunArchiveError as error:
+            print(f"fatal: {error}")
+            exit(1)
+        seed = Archive.seed if seed is None else seed
+    elif OptionParser.get("record"):
+        seed = random.getrandbits(32) if seed is None else seed
+        Archive = runArchive.RunArchive(OptionParser.get("record"), seed)
+    Trace = None
+    if OptionParser.get("trace"):
+        Trace = traceRecorder.TraceRecorder(OptionParser.get("trace"))
+    Driver = compilationDriver.CompilationDriver(
+        is_verbose,
+        cc_path,
+        sim_path,
+        Cache,
+        save_temps=OptionParser.get("save_temps"),
+        single_invocation=OptionParser.get("single_invocation"),
+        pipe=OptionParser.get("pipe"),
+        jobs=OptionParser.get("jobs"),
+        batch=OptionParser.get("batch"),
+        speculate=OptionParser.get("speculate"),
+        binary_dump=OptionParser.get("binary_dump"),
+        seed=seed,
+        results=Results,
+        archive=Archive,
+        trace=Trace,
+    )
 
     # Run tests and generate summary report
-    run_analyzers(Driver, Report, Target)
-    Report.generateReport()
-
-    if not OptionParser.get("save_temps"):
-        helper.cleanup()
+    try:
+        run_analyzers(Driver, Report, Target, OptionParser.get("jobs"))
+        Report.generateReport()
+    finally:
+        # Remove the temporary files of this run, unless `--save-temps`.
+        Driver.close()
+    if Trace:
+        print(f"Trace written to {Trace.path}")
+    if Cache:
+        print(f"Artifact cache: {Cache.stats()}")
+        print(f"Result cache: {Results.stats()}")
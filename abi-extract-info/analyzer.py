@@ -4,9 +4,12 @@
 # This source code is licensed under the GPL-3.0 license found in
 # the LICENSE file in the root directory of this source tree.
 
-import tempfile
 import os
 
+import caseBatch
+import dumpInformation
+import helper
+
 
 class AnalyzerError(Exception):
     """
@@ -32,6 +35,10 @@ class Analyzer:
     An analyzer implementation is expected to call `Analyzer.__init__` with a
     name. This name will be used for debug logging and temporary file names.
 
+    An analyzer declares the `TargetArch` facts it sets in `provides`, and
+    the ones it uses in `requires`. The scheduler runs it once the analyzers
+    providing its requirements are done, see `scheduler.py`.
+
     A basic implementation looks like this:
     ```
     class FooAnalyzer(Analyzer):
@@ -44,13 +51,35 @@ class Analyzer:
     ```
     """
 
+    # `TargetArch` facts set and used by the analyzer, e.g "type_details".
+    provides = []
+    requires = []
+    # Maximum number of test cases built into a single program, see
+    # `generate_batch`.
+    batch_size = 64
+
     def __init__(self, Driver, Report, Target, name):
         self.Driver = Driver
         self.Report = Report
         self.Target = Target
         self.name = name
-        self.source_files = ["src/helper.c"]
-        self.assembly_files = ["src/arch/riscv.S"]
+        # Sources shared by every test program. They are only built once per
+        # run by the driver, see `CompilationDriver.runtime`.
+        self.runtime_files = ["src/helper.c", "src/arch/riscv.S"]
+        self.source_files = []
+        self.assembly_files = []
+
+    def value_generator(self, *case):
+        """
+        Returns a `helper.ValueGenerator` for the test case identified by
+        `case` (e.g a datatype and an argument count). When the run is seeded
+        (see `--seed`), its values only depend on the seed, the analyzer and
+        the test case, so a test case gets the same source in every run,
+        whatever the order test cases are generated in.
+        """
+        return helper.ValueGenerator(
+            helper.derive_seed(self.Driver.seed, self.name, *case)
+        )
 
     def generate(self, srcs=None):
         """
@@ -60,29 +89,91 @@ class Analyzer:
 
         Providing an argument is optional. If none is specified, just the
         members of `self.source_files` and `self.assembly_files` will be
-        compiled.
+        compiled. Both are linked with the prebuilt `self.runtime_files`.
+        """
+        return self.Driver.wait(self.generate_async(srcs))
+
+    async def generate_async(self, srcs=None):
+        """
+        Coroutine version of `generate`. Tests awaited together, e.g with
+        `run_concurrently`, are built and simulated at the same time, up to
+        the number of jobs of the driver.
         """
         if srcs is None:
             srcs = []
         if not isinstance(srcs, list):
             srcs = [srcs]
-        temp_source_files = []
-        for src in srcs:
-            (handle, temp_source_file) = tempfile.mkstemp(
-                suffix=".c", prefix=self.name, dir="tmp/", text=True
+        with self.Driver.span(
+            "tests", self.name, {"sources": len(srcs)}
+        ) as args:
+            res, stdout = await self.Driver.runAsync(
+                self.source_files,
+                self.assembly_files,
+                self.name,
+                runtimeFiles=self.runtime_files,
+                sources=srcs,
             )
-            with os.fdopen(handle, "w") as file:
-                file.write(src)
-            temp_source_files.append(temp_source_file)
-        res, stdout_file = self.Driver.run(
-            self.source_files + temp_source_files,
-            self.assembly_files,
-            self.name,
-        )
+            args["exit_code"] = res
+            args["stdout_bytes"] = len(stdout or "")
         if res != 0:
             raise AnalyzerError
-        with open(stdout_file, "r", encoding="utf-8") as file:
-            return file.read()
+        return stdout
+
+    def generate_batch(self, cases):
+        """
+        This method takes a list of strings, each containing the C source
+        code of an independent test case with its own `main` function. The
+        test cases are built into as few programs as possible (see
+        `caseBatch.py`), which are simulated concurrently.
+
+        Returns a list with one `(stdout, dump_information)` tuple per test
+        case, in order. `dump_information` is the parsed `DumpInformation`
+        of the test case. Raises `AnalyzerError` if a test case did not dump
+        any, e.g when it crashed.
+        """
+        return self.Driver.wait(self.generate_batch_async(cases))
+
+    async def generate_batch_async(self, cases):
+        """
+        Coroutine version of `generate_batch`.
+        """
+        batches = [
+            cases[index : index + self.batch_size]
+            for index in range(0, len(cases), self.batch_size)
+        ]
+        results = await self.Driver.gather(
+            [self.generate_cases_async(batch) for batch in batches]
+        )
+        return [result for batch in results for result in batch]
+
+    async def generate_cases_async(self, cases):
+        stdout = await self.generate_async(
+            [
+                caseBatch.prepare_case(index, src)
+                for index, src in enumerate(cases)
+            ]
+            + [caseBatch.DispatcherGenerator(len(cases)).generate()]
+        )
+        outputs = caseBatch.split_cases(stdout, len(cases))
+        if outputs is None:
+            raise AnalyzerError
+
+        results = []
+        for output in outputs:
+            if not dumpInformation.has_dump(output):
+                raise AnalyzerError
+            dump_information = dumpInformation.DumpInformation()
+            dump_information.parse(output)
+            results.append((output, dump_information))
+        return results
+
+    def run_concurrently(self, coros):
+        """
+        Runs a list of coroutines concurrently (e.g one per data type) and
+        returns their results in the same order. Coroutines must not call
+        the blocking `generate`, but await `generate_async` instead.
+        """
+        return self.Driver.waitAll(coros)
 
     def analyze(self):
         """
@@ -96,15 +187,39 @@ class Analyzer:
         """
         return self.generate()
 
+    def execute(self):
+        """
+        Runs the analyzer and writes the analysis result to a summary file.
+        Returns the path of the summary file, or None if the analyzer failed.
+        """
+        # Traced as a span, see `--trace`.
+        with self.Driver.span("analyzers", self.name) as args:
+            try:
+                # Restore the result of a previous run, see `resultCache.py`.
+                results = self.Driver.results
+                key = results.key(self) if results else None
+                summary_content = results.lookup(self, key) if results else None
+                args["cached"] = summary_content is not None
+                if summary_content is None:
+                    summary_content = self.analyze()
+                    if results:
+                        results.store(self, key, summary_content)
+
+                summary_file = os.path.join(
+                    self.Driver.workspace, f"{self.name}.sum"
+                )
+                with open(summary_file, "w", encoding="utf-8") as file:
+                    file.write(summary_content)
+                return summary_file
+            except (AnalyzerError, helper.ValueGeneratorError):
+                args["failed"] = True
+                print(f"Skip: '{self.name}' analyzer failed.")
+                return None
+
     def run(self):
         """
         Runs the analyzer and attaches the analysis result to the report.
         """
-        try:
-            summary_content = self.analyze()
-            summary_file = f"tmp/{self.name}.sum"
-            with open(summary_file, "w", encoding="utf-8") as file:
-                file.write(summary_content)
+        summary_file = self.execute()
+        if summary_file is not None:
             self.Report.append(summary_file)
-        except AnalyzerError:
-            print(f"Skip: '{self.name}' analyzer failed.")
@@ -5,9 +5,11 @@
 # the LICENSE file in the root directory of this source tree.
 
 import analyzer
+import boundarySearch
 import helper
 import hexUtils
 import dumpInformation
+import valueMatch
 
 """
 The purpose of this class is to generate a variety of C test cases using
@@ -415,60 +417,167 @@ class ArgPassTests:
 
 
 class ArgPassAnalyzer(analyzer.Analyzer):
+    provides = ["register_size", "argument_registers"]
+    requires = ["type_details"]
+
     def __init__(self, Driver, Report, Target):
         super().__init__(Driver, Report, Target, "argpass")
 
-    def analyze(self):
-        # List of datatypes to be tested.
-        types = ["char", "short", "int", "long", "long long", "float", "double"]
-
-        results = {}
-        for dtype in types:
-            # Create an instance of `ArgPassTests` for the current Target
-            arg_pass_tests = ArgPassTests(self.Target)
-
-            dtype_sizeof = self.Target.get_type_details(dtype)["size"]
-            results[dtype] = []
-
-            argc = 1
-            while True:
-                # Generate hexadecimal values for the current datatype and count
-                helper.reset_used_values()
-                argv = helper.generate_hexa_list(argc, dtype_sizeof)
-
-                # Generate the content of the test file.
-                stdout = self.generate(
-                    ArgPassGenerator(self.Target).generate(dtype, argv)
-                )
+    # Datatypes to be tested.
+    dtypes = ["char", "short", "int", "long", "long long", "float", "double"]
+    # Maximum argument count tested for a datatype by the batched sweep.
+    max_argc = 20
+    # Maximum argument count searched, C compilers support at least 127
+    # parameters.
+    argc_limit = 127
+
+    # Set the register sizes of the target from the dump of a test.
+    def set_register_sizes(self, dump_information):
+        for (
+            bank_id,
+            reg_info,
+        ) in dump_information.get_reg_bank_infos().items():
+            self.Target.set_register_size(bank_id, reg_info["size"])
+
+    # Check where the values `argv` were passed, from the dump of a test.
+    def check(self, arg_pass_tests, argv, dump_information):
+        self.set_register_sizes(dump_information)
+
+        # Get the stack and register bank information
+        stack = dump_information.get_stack()
+        reg_banks = dump_information.get_reg_banks()
+        # Run the test to check if the value is in the stack
+        return arg_pass_tests.run_test(stack, reg_banks, argv)
+
+    # Whether `value` is passed (entirely) in registers.
+    def in_registers(self, value, reg_banks):
+        hutils = hexUtils.HexUtils(self.Target)
+        registers, _ = hutils.find_registers_fill([value], reg_banks)
+        pairs, _, _ = hutils.find_registers_pairs([value], reg_banks)
+        return bool(registers or pairs)
+
+    # Search the first argument count of `dtype` for which a value is passed
+    # on the stack. Returns the result of each argument count up to it.
+    async def analyze_dtype(self, dtype):
+        # Create an instance of `ArgPassTests` for the current Target
+        arg_pass_tests = ArgPassTests(self.Target)
+
+        dtype_sizeof = self.Target.get_type_details(dtype)["size"]
+
+        # Test `argc` arguments, the predicate holds once the last one is
+        # not passed in registers anymore. Checking the registers as well
+        # keeps it monotone when the last value is past the dumped stack.
+        async def probe(argc):
+            # Generate hexadecimal values for the current datatype and count
+            values = self.value_generator(dtype, argc)
+            argv = values.generate_hexa_list(argc, dtype_sizeof)
+
+            # Generate the content of the test file.
+            stdout = await self.generate_async(
+                ArgPassGenerator(self.Target).generate(dtype, argv)
+            )
 
-                # Parse the stdout to extract stack and register bank information.
-                dump_information = dumpInformation.DumpInformation()
-                dump_information.parse(stdout)
+            # Parse the stdout to extract stack and register bank information.
+            dump_information = dumpInformation.DumpInformation()
+            dump_information.parse(stdout)
 
-                for (
-                    bank_id,
-                    reg_info,
-                ) in dump_information.get_reg_bank_infos().items():
-                    self.Target.set_register_size(bank_id, reg_info["size"])
+            citeration = self.check(arg_pass_tests, argv, dump_information)
+            holds = citeration["value_in_stack"] or not self.in_registers(
+                argv[-1], dump_information.get_reg_banks()
+            )
+            return bool(holds), (argv, dump_information, citeration)
 
-                # Get the stack and register bank information
-                stack = dump_information.get_stack()
-                reg_banks = dump_information.get_reg_banks()
-                # Run the test to check if the value is in the stack
-                citeration = arg_pass_tests.run_test(stack, reg_banks, argv)
+        search = boundarySearch.BoundarySearch(
+            probe, 1, self.argc_limit, self.Driver.speculate
+        )
+        boundary = await search.run()
+        if boundary is None:
+            print("DEBUG: Exitting for save purposes. [do_argpas]")
+            argv, dump_information, _ = search.result(self.argc_limit)
+            return self.derive(arg_pass_tests, argv, dump_information)
+
+        results = []
+        if boundary > 1:
+            # All the values of the argument count right below the boundary
+            # are passed in registers, and the ones of smaller argument
+            # counts are passed the same way.
+            argv, dump_information, _ = search.result(boundary - 1)
+            results += self.derive(arg_pass_tests, argv, dump_information)
+        _, _, citeration = search.result(boundary)
+        results.append(citeration)
+        return results
 
-                results[dtype].append(citeration)
-                if citeration["value_in_stack"]:
-                    break
+    # The result of each argument count from 1 to `len(argv)`, out of the
+    # dump of the test with `argv`.
+    def derive(self, arg_pass_tests, argv, dump_information):
+        stack = dump_information.get_stack()
+        reg_banks = dump_information.get_reg_banks()
+        return [
+            arg_pass_tests.run_test(stack, reg_banks, argv[:argc])
+            for argc in range(1, len(argv) + 1)
+        ]
+
+    # Same as `analyze_dtype`, but every argument count is tested at once, as
+    # a single batch of test cases. The results past the first value passed
+    # on the stack are discarded.
+    async def analyze_dtype_batch(self, dtype):
+        arg_pass_tests = ArgPassTests(self.Target)
+
+        dtype_sizeof = self.Target.get_type_details(dtype)["size"]
+
+        # The values are unique across the whole batch.
+        values = self.value_generator(dtype, "batch")
+        argvs = [
+            values.generate_hexa_list(argc, dtype_sizeof)
+            for argc in range(1, self.max_argc + 1)
+        ]
+        outputs = await self.generate_batch_async(
+            [
+                ArgPassGenerator(self.Target).generate(dtype, argv)
+                for argv in argvs
+            ]
+        )
 
-                if argc == 20:
-                    print("DEBUG: Exitting for save purposes. [do_argpas]")
-                    break
+        # Match the values of every test case at once.
+        dump_informations = [d for _, d in outputs]
+        if dump_informations:
+            self.set_register_sizes(dump_informations[0])
+        valueMatch.match_dumps(self.Target, dump_informations, argvs)
+
+        results = []
+        for argv, dump_information in zip(argvs, dump_informations):
+            citeration = self.check(arg_pass_tests, argv, dump_information)
+
+            results.append(citeration)
+            if citeration["value_in_stack"]:
+                break
+        else:
+            print("DEBUG: Exitting for save purposes. [do_argpas]")
+
+        return results
 
-                argc += 1
+    def analyze(self):
+        types = self.dtypes
+
+        # The datatypes are independent from each other, test them all at
+        # the same time.
+        results = dict(
+            zip(
+                types,
+                self.run_concurrently(
+                    [
+                        (
+                            self.analyze_dtype_batch(dtype)
+                            if self.Driver.batch
+                            else self.analyze_dtype(dtype)
+                        )
+                        for dtype in types
+                    ]
+                ),
+            )
+        )
 
-            if dtype == "int":
-                self.Target.set_argument_registers(citeration["registers"])
+        self.Target.set_argument_registers(results["int"][-1]["registers"])
 
         # Process the results
-        return arg_pass_tests.process_stages(results)
+        return ArgPassTests(self.Target).process_stages(results)
@@ -4,8 +4,6 @@
 # This source code is licensed under the GPL-3.0 license found in
 # the LICENSE file in the root directory of this source tree.
 
-import random
-
 import analyzer
 import helper
 
@@ -68,8 +66,10 @@ For short example:
 
 
 class BitFieldGenerator:
-    def __init__(self, Target):
+    def __init__(self, Target, values=None):
         self.Target = Target
+        # `helper.ValueGenerator` of the bitfield sizes and values.
+        self.values = values or helper.ValueGenerator()
         self.result = []
         self.names = []
         self.data = self.generate_data()
@@ -80,14 +80,14 @@ class BitFieldGenerator:
     def gen_tuple(self, sizeof, sign):
         while True:
             # In the latest Python versions (current 3.12.3),
-            # the `random.randint()` function can no longer
+            # the `Random.randint()` function can no longer
             # accept a float object as input.
             # A division expression will result in a floating
             # point value, so it must be converted to integer.
             # I.e `8 / 4 = 2.0`
             limit = sizeof - int(sizeof / 4)
-            value1 = random.randint(1, limit)
-            value2 = random.randint(1, limit)
+            value1 = self.values.random.randint(1, limit)
+            value2 = self.values.random.randint(1, limit)
 
             if sign == ">":
                 if value1 + value2 > sizeof:
@@ -252,8 +252,10 @@ class BitFieldGenerator:
         hvalues = []
         for i, bfield in enumerate(bitfields):
             replace_msb_by_one = True
-            helper.reset_used_values()
-            bvalue = helper.generate_binary_value(bfield, replace_msb_by_one)
+            self.values.reset()
+            bvalue = self.values.generate_binary_value(
+                bfield, replace_msb_by_one
+            )
             hvalue = helper.binary_to_hexa(bvalue)
             tmp_str += f".x{i} = {hvalue}, "
             hvalues.append(hvalue)
@@ -711,10 +713,16 @@ class BitFieldTests:
 
 
 class BitFieldAnalyzer(analyzer.Analyzer):
+    requires = ["type_details"]
+
     def __init__(self, Driver, Report, Target):
         super().__init__(Driver, Report, Target, "bitfield")
 
     def analyze(self):
         return BitFieldTests().prepare_summary(
-            self.generate(BitFieldGenerator(self.Target).generate())
+            self.generate(
+                BitFieldGenerator(
+                    self.Target, self.value_generator()
+                ).generate()
+            )
         )
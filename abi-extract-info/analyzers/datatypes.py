@@ -227,6 +227,8 @@ class DatatypesTests:
 
 
 class DataTypesAnalyzer(analyzer.Analyzer):
+    provides = ["type_details"]
+
     def __init__(self, Driver, Report, Target):
         super().__init__(Driver, Report, Target, "datatypes")
 
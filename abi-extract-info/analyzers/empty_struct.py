@@ -139,23 +139,9 @@ class EmptyStructValidator:
 
         return is_ignored
 
-    # This function should be in the "dumpInformation" class. FIXME
     def split_sections(self, Content):
-        result = []
-        current_sublist = []
-        Content = Content.splitlines()
-
-        for c in Content:
-            if "// Done" in c:
-                result.append(current_sublist)
-                current_sublist = []
-            else:
-                current_sublist.append(c)
-
-        dump_information = dumpInformation.DumpInformation()
-        for count, sublist in enumerate(result):
-            dump_information.parse_lines(sublist)
-
+        dumps = dumpInformation.parse_dumps(Content)
+        for count, dump_information in enumerate(dumps):
             for key, value in dump_information.RegBanks.items():
                 is_ignored = self.validate_if_ignored(key, value, count + 1)
                 if is_ignored is False:
@@ -8,6 +8,7 @@ import analyzer
 import helper
 import hexUtils
 import dumpInformation
+import valueMatch
 
 """
 The purpose of this generator is to create a test case
@@ -202,23 +203,26 @@ class ReturnTests:
 
 
 class ReturnAnalyzer(analyzer.Analyzer):
+    requires = ["type_details", "register_size"]
+    # Datatypes to be tested.
+    dtypes = ["char", "short", "int", "long", "long long", "float", "double"]
+
     def __init__(self, Driver, Report, Target):
         super().__init__(Driver, Report, Target, "return")
-        self.assembly_files += ["src/arch/riscv2.s"]
+        self.runtime_files += ["src/arch/riscv2.s"]
         self.return_tests = ReturnTests(Target)
 
-    def analyze_for_dtype(self, dtype):
+    # Build and run the test of `dtype`. Returns the value returned and the
+    # dump of the test.
+    async def analyze_for_dtype(self, dtype):
         # Get the sizeof the current data type.
         sizeof = self.Target.get_type_details(dtype)["size"]
 
-        # Reset the already used values.
-        helper.reset_used_values()
-
         # Generate a single hexadecimal value.
-        hvalue_return = helper.generate_hexa_value(sizeof)
+        hvalue_return = self.value_generator(dtype).generate_hexa_value(sizeof)
 
         # Generate and build/execute the test case.
-        stdout = self.generate(
+        stdout = await self.generate_async(
             ReturnGenerator(self.Target, dtype).generate_single_call(
                 hvalue_return
             )
@@ -227,31 +231,33 @@ class ReturnAnalyzer(analyzer.Analyzer):
         # Parse the dump information.
         dump_information = dumpInformation.DumpInformation()
         dump_information.parse(stdout)
+        return hvalue_return, dump_information
 
-        # Get stack and register bank information
-        stack = dump_information.get_stack()
-        register_banks = dump_information.get_reg_banks()
+    def analyze(self):
+        dtypes = self.dtypes
 
-        citeration = {}
-        self.return_tests.run_test(
-            citeration, stack, register_banks, hvalue_return
+        outputs = self.run_concurrently(
+            [self.analyze_for_dtype(dtype) for dtype in dtypes]
         )
-        return citeration
 
-    def analyze(self):
-        dtypes = [
-            "char",
-            "short",
-            "int",
-            "long",
-            "long long",
-            "float",
-            "double",
-        ]
+        # Match the values returned for every datatype at once.
+        valueMatch.match_dumps(
+            self.Target,
+            [dump_information for _, dump_information in outputs],
+            [[hvalue_return] for hvalue_return, _ in outputs],
+        )
 
         results = {}
-        for dtype in dtypes:
+        for dtype, (hvalue_return, dump_information) in zip(dtypes, outputs):
+            # Get stack and register bank information
+            stack = dump_information.get_stack()
+            register_banks = dump_information.get_reg_banks()
+
+            citeration = {}
+            self.return_tests.run_test(
+                citeration, stack, register_banks, hvalue_return
+            )
             results[dtype] = []
-            results[dtype].append(self.analyze_for_dtype(dtype))
+            results[dtype].append(citeration)
 
         return self.return_tests.generate_summary(results)
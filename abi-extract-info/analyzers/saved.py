@@ -137,6 +137,8 @@ class SavedTests:
 
 
 class SavedAnalyzer(analyzer.Analyzer):
+    requires = ["type_details"]
+
     def __init__(self, Driver, Report, Target):
         super().__init__(Driver, Report, Target, "saved")
 
@@ -144,9 +146,9 @@ class SavedAnalyzer(analyzer.Analyzer):
         sizeof = self.Target.get_type_details("int")["size"]
 
         # Generate value for callee/caller saved registers.
-        helper.reset_used_values()
-        hvalue_caller_saved = helper.generate_hexa_value(sizeof)
-        hvalue_callee_saved = helper.generate_hexa_value(sizeof)
+        values = self.value_generator()
+        hvalue_caller_saved = values.generate_hexa_value(sizeof)
+        hvalue_callee_saved = values.generate_hexa_value(sizeof)
 
         stdout = self.generate(
             [
@@ -5,9 +5,11 @@
 # the LICENSE file in the root directory of this source tree.
 
 import analyzer
+import boundarySearch
 import helper
 import hexUtils
 import dumpInformation
+import valueMatch
 
 from analyzers.empty_struct import EmptyStructAnalyzer
 
@@ -91,9 +93,10 @@ struct assignmentType {
         # disambiguate as they can contain identical values. We avoid the use
         # of temporary registers this way. Instead they tend to be loaded
         # directly in the correct register from memory.
+        # It is `static` so that test cases can be batched, see `caseBatch.py`.
         self.append(
             """
-union {
+static union {
     struct structType structTypeObject;
     struct assignmentType a;
 } u = { %s };
@@ -393,23 +396,36 @@ class StructBoundaryAnalyzerSpecialCase(analyzer.Analyzer):
             ["float", "float", "float"],
             ["float", "char", "char"],
         ]
+        # The special cases are independent, build them as a single batch.
+        # The values are unique across the whole batch.
+        values = self.value_generator()
+        cases = []
         for dtypes in special_cases:
-            dtypes_str = ", ".join(dtypes)
-            sc_results[dtypes_str] = []
-
-            hvalues = helper.generate_hexa_list_from_datatypes(
+            hvalues = values.generate_hexa_list_from_datatypes(
                 dtypes, self.Target
             )
-
-            stdout = self.generate(
-                StructGenerator(self.Target, None, dtypes).generate_single_call(
-                    hvalues
+            cases.append(
+                (
+                    dtypes,
+                    hvalues,
+                    StructGenerator(
+                        self.Target, None, dtypes
+                    ).generate_single_call(hvalues),
                 )
             )
 
-            # Parse the dump information.
-            dump_information = dumpInformation.DumpInformation()
-            dump_information.parse(stdout)
+        outputs = self.generate_batch([src for _, _, src in cases])
+        # Match the values of every test case at once.
+        valueMatch.match_dumps(
+            self.Target,
+            [dump_information for _, dump_information in outputs],
+            [hvalues for _, hvalues, _ in cases],
+        )
+        for (dtypes, hvalues, _), (stdout, dump_information) in zip(
+            cases, outputs
+        ):
+            dtypes_str = ", ".join(dtypes)
+            sc_results[dtypes_str] = []
 
             # Get stack and register bank information
             stack = dump_information.get_stack()
@@ -440,70 +456,90 @@ class StructBoundaryAnalyzerSpecialCase(analyzer.Analyzer):
 
 
 class StructBoundaryAnalyzer(analyzer.Analyzer):
+    provides = ["register_bank_count"]
+    requires = ["type_details", "register_size", "argument_registers"]
+
     def __init__(self, Driver, Report, Target):
         super().__init__(Driver, Report, Target, "struct_boundary")
 
-    def analyze_char_limit(self, results):
-        # The `char_limit` is calculated with the `char` datatype.
-        # The test case will generate multiple C files to test the struct
-        # boundaries, char by char. Once it reaches the stack as reference,
-        # the `char_limit` is defined.
-        # Start the char limit count with 1.
-        char_limit = 1
-
-        dtype = "char"
-        results[dtype] = []
-        char_sizeof = self.Target.get_type_details(dtype)["size"]
-
-        # Reset the used generated values.
-        helper.reset_used_values()
-        while True:
-            # Generate a hexadecimal value list according to the current count.
-            hvalues = helper.generate_hexa_list(char_limit, char_sizeof)
-
-            # Generate and build/execute the test case.
-            dtypes = [dtype] * char_limit
-            stdout = self.generate(
-                StructGenerator(
-                    self.Target, char_limit, dtypes
-                ).generate_single_call(hvalues)
+    # Maximum member count searched for a struct.
+    member_limit = 1023
+
+    # Maximum count of `dtype` members searched for a struct, from `start`
+    # members: up to `member_limit` more, as long as each member gets a
+    # unique value (e.g only 225 `char` values, see
+    # `helper.ValueGenerator.capacity`).
+    def search_limit(self, dtype, start=0):
+        sizeof = self.Target.get_type_details(dtype)["size"]
+        capacity = helper.ValueGenerator.capacity(sizeof * 8)
+        return max(min(self.member_limit, capacity - start), 0)
+
+    # Build and execute a test case passing a struct of `dtypes`. Returns
+    # whether the struct was passed by reference, and the test result.
+    async def probe(self, dtype, dtypes, hvalues):
+        # Generate and build/execute the test case.
+        stdout = await self.generate_async(
+            StructGenerator(self.Target, None, dtypes).generate_single_call(
+                hvalues
             )
+        )
 
-            struct_tests = StructTests(self.Target)
+        struct_tests = StructTests(self.Target)
 
-            # Parse the dump information.
-            dump_information = dumpInformation.DumpInformation()
-            dump_information.parse(stdout)
+        # Parse the dump information.
+        dump_information = dumpInformation.DumpInformation()
+        dump_information.parse(stdout)
+
+        # Get stack and register bank information.
+        stack = dump_information.get_stack()
+        reg_banks = dump_information.get_reg_banks()
+
+        # Extract the struct sizeof from C test case.
+        # Regular expression to match the size
+        regex = r"Sizeof\(struct structType\): (\d+)"
+        size = helper.parse_regex(regex, stdout)
+
+        citeration = {}
+        citeration["sizeof(S)"] = size
+        struct_tests.run_test(citeration, dtype, stack, reg_banks, hvalues)
+        return citeration["passed_by_ref"] != None, (
+            citeration,
+            dump_information,
+        )
 
-            # Get stack and register bank information.
-            stack = dump_information.get_stack()
-            reg_banks = dump_information.get_reg_banks()
+    # Results of the probes right below and at the `boundary`.
+    def boundary_results(self, search, boundary):
+        sizes = [size for size in search.probed() if size <= boundary]
+        return [search.result(size)[0] for size in sizes[-2:]]
 
-            # Extract the struct sizeof from C test case.
-            # Regular expression to match the size
-            regex = r"Sizeof\(struct structType\): (\d+)"
-            size = helper.parse_regex(regex, stdout)
+    def analyze_char_limit(self, results):
+        # The `char_limit` is calculated with the `char` datatype.
+        # The test case searches the struct boundaries, in chars. Once the
+        # struct reaches the stack as reference, the `char_limit` is defined.
+        dtype = "char"
+        char_sizeof = self.Target.get_type_details(dtype)["size"]
 
-            citeration = {}
-            citeration["sizeof(S)"] = size
-            struct_tests.run_test(citeration, dtype, stack, reg_banks, hvalues)
-            results[dtype].append(citeration)
-            if citeration["passed_by_ref"] != None:
-                break
+        async def probe(char_limit):
+            # Generate a hexadecimal value list according to the current count.
+            values = self.value_generator(dtype, char_limit)
+            hvalues = values.generate_hexa_list(char_limit, char_sizeof)
+            return await self.probe(dtype, [dtype] * char_limit, hvalues)
 
-            # The struct has not been passed by reference yet, so increment
-            # the char limit by one.
-            char_limit += 1
-            if char_limit == 20:
-                print("breaking for safe purposes [struct_boundaries]")
-                break
+        # Start the char limit count with 1.
+        limit = self.search_limit(dtype)
+        search = boundarySearch.BoundarySearch(
+            probe, 1, limit, self.Driver.speculate
+        )
+        boundary = self.Driver.wait(search.run())
+        if boundary is None:
+            print("breaking for safe purposes [struct_boundaries]")
+            boundary = limit
+        results[dtype] = self.boundary_results(search, boundary)
 
-        # Set back to the char's limit as its currently out of bounds.
-        return char_limit - 1
+        # Set back to the char's limit as the boundary is out of bounds.
+        return boundary - 1
 
     def analyze_struct_types(self, results, char_limit):
-        struct_tests = StructTests(self.Target)
-
         # `long double` needs a different treating because its size
         # can be 16 bytes in a 32-bit architecture. That means that
         # the values are splitten in 4, and so that implementation
@@ -515,8 +551,6 @@ class StructBoundaryAnalyzer(analyzer.Analyzer):
         register_bank_count = 0
 
         for dtype in types:
-            results[dtype] = []
-
             # Get datatype size from stored information from previous test case.
             sizeof_dtype = self.Target.get_type_details(dtype)["size"]
 
@@ -524,50 +558,32 @@ class StructBoundaryAnalyzer(analyzer.Analyzer):
             limit_dtype = char_limit // sizeof_dtype
 
             # The expected boundary may not be reached with the previously
-            # calculated limit. In that case, we increment the limit_dtype by 1
-            # and recalculate for the given data type. A maximum of 10 iterations
-            # is enforced to prevent infinite loops.
-            reached_boundary = False
-            while not reached_boundary and limit_dtype < 10:
-                # Generate the struct hexadecimal values with a list of data types.
-                # Plus one char to validate the limit.
-                for index, i in enumerate([[], ["char"]]):
-                    dtypes = [dtype] * limit_dtype + i
-                    hvalues = helper.generate_hexa_list_from_datatypes(
-                        dtypes, self.Target
-                    )
-                    # Generate and build/execute the test case.
-                    stdout = self.generate(
-                        StructGenerator(
-                            self.Target, None, dtypes
-                        ).generate_single_call(hvalues)
-                    )
+            # calculated limit. The search goes through the struct of
+            # `limit_dtype` members, then plus one char to validate the
+            # limit, then `limit_dtype + 1` members...
+            async def probe(index, dtype=dtype, limit_dtype=limit_dtype):
+                dtypes = [dtype] * (limit_dtype + index // 2)
+                dtypes += ["char"] * (index % 2)
+                values = self.value_generator(dtype, limit_dtype, index)
+                hvalues = values.generate_hexa_list_from_datatypes(
+                    dtypes, self.Target
+                )
+                return await self.probe(dtype, dtypes, hvalues)
 
-                    # Parse the dump information.
-                    dump_information = dumpInformation.DumpInformation()
-                    dump_information.parse(stdout)
-
-                    # Get stack and register bank information
-                    stack = dump_information.get_stack()
-                    reg_banks = dump_information.get_reg_banks()
-                    # Get the register bank count from the header dump information.
-                    register_bank_count = dump_information.get_reg_bank_count()
-
-                    # Extract the struct sizeof from C test case.
-                    # Regular expression to match the size
-                    regex = r"Sizeof\(struct structType\): (\d+)"
-                    size = helper.parse_regex(regex, stdout)
-
-                    citeration = {}
-                    citeration["sizeof(S)"] = size
-                    struct_tests.run_test(
-                        citeration, dtype, stack, reg_banks, hvalues
-                    )
-                    results[dtype].append(citeration)
-                    if citeration["passed_by_ref"] != None:
-                        reached_boundary = True
-                        break
-                limit_dtype = limit_dtype + 1
+            # The largest struct probed has `limit_dtype` members, plus
+            # half of the index.
+            limit = 2 * self.search_limit(dtype, limit_dtype)
+            search = boundarySearch.BoundarySearch(
+                probe, 0, limit, self.Driver.speculate
+            )
+            boundary = self.Driver.wait(search.run())
+            if boundary is None:
+                boundary = limit
+            results[dtype] = self.boundary_results(search, boundary)
+
+            # Get the register bank count from the header dump information.
+            _, dump_information = search.result(boundary)
+            register_bank_count = dump_information.get_reg_bank_count()
 
         # Store the register bank count.
         self.Target.set_register_bank_count(register_bank_count)
@@ -575,8 +591,6 @@ class StructBoundaryAnalyzer(analyzer.Analyzer):
     def analyze_struct_boundaries(self):
         results = {}
         char_limit = self.analyze_char_limit(results)
-        # Reset used values.
-        helper.reset_used_values()
         self.analyze_struct_types(results, char_limit)
 
         return StructTests(self.Target).prepare_summary(results)
@@ -0,0 +1,133 @@
+#! /bin/env python
+# Copyright 2025-present, Synopsys, Inc.
+# All rights reserved.
+#
+# This source code is licensed under the GPL-3.0 license found in
+# the LICENSE file in the root directory of this source tree.
+
+"""
+This cache stores the outputs of the compiler and the assembler on disk,
+so that identical invocations across analyzers and across runs can reuse
+them instead of spawning the toolchain again.
+
+Entries are content-addressed: the key is a hash of everything that can
+influence the output (wrapper script, toolchain version, flags and source
+bytes). The total size of the cache is bounded, the least recently used
+entries are evicted first.
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+
+
+class ArtifactCache:
+    def __init__(self, directory, max_size):
+        self.directory = directory
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+        self.size = sum(size for _, size, _ in self._entries())
+
+    # Build a key out of a list of strings or bytes.
+    def key(self, *parts):
+        digest = hashlib.sha256()
+        for part in parts:
+            if isinstance(part, str):
+                part = part.encode()
+            # Prefix each part with its length so that parts cannot be
+            # confused with each other when concatenated.
+            digest.update(b"%d:" % len(part))
+            digest.update(part)
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key)
+
+    # List the cache entries as (path, size, last use) tuples.
+    def _entries(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            # Skip the partially written entries of concurrent runs, and the
+            # directories of other caches (see `resultCache.py`).
+            if entry.name.startswith(".") or not entry.is_file():
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((entry.path, stat.st_size, stat.st_mtime))
+        return entries
+
+    # Copy the cached artifact to `OutputFile`. Returns False on a miss.
+    def lookup(self, key, OutputFile):
+        path = self._path(key)
+        try:
+            shutil.copyfile(path, OutputFile)
+            # Mark the entry as recently used.
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return False
+
+        self.hits += 1
+        return True
+
+    # Return the cached bytes for `key`, or None on a miss.
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return data
+
+    # Store `OutputFile` as the artifact for `key`.
+    def store(self, key, OutputFile):
+        # Write to a temporary file first and move it into place, so that a
+        # concurrent run never sees a partially written entry.
+        handle, temp_path = tempfile.mkstemp(prefix=".", dir=self.directory)
+        os.close(handle)
+        shutil.copyfile(OutputFile, temp_path)
+        self._commit(key, temp_path)
+
+    # Store the bytes `data` for `key`.
+    def put(self, key, data):
+        handle, temp_path = tempfile.mkstemp(prefix=".", dir=self.directory)
+        with os.fdopen(handle, "wb") as file:
+            file.write(data)
+        self._commit(key, temp_path)
+
+    # Move the written entry `temp_path` into place for `key`.
+    def _commit(self, key, temp_path):
+        # Sized before it is moved, as a concurrent run sharing the directory
+        # may evict the entry right away.
+        size = os.path.getsize(temp_path)
+        os.replace(temp_path, self._path(key))
+
+        self.size += size
+        if self.size > self.max_size:
+            self.evict()
+
+    # Remove the least recently used entries until the cache fits its bound.
+    def evict(self):
+        entries = sorted(self._entries(), key=lambda entry: entry[2])
+        self.size = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if self.size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            self.size -= size
+
+    def stats(self):
+        return f"{self.hits} hits, {self.misses} misses"
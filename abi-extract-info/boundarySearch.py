@@ -0,0 +1,108 @@
+#! /bin/env python
+# Copyright 2025-present, Synopsys, Inc.
+# All rights reserved.
+#
+# This source code is licensed under the GPL-3.0 license found in
+# the LICENSE file in the root directory of this source tree.
+
+"""
+Several analyzers look for a boundary: the first argument count for which a
+value is passed on the stack, the first struct size passed by reference...
+Testing every size one at a time takes one build and simulation per size.
+
+This search finds the first `n` for which a monotone predicate holds (false
+for every size below the boundary, true from the boundary on) with a number
+of probes growing logarithmically with the boundary. It first gallops, doubling
+the step after each probe below the boundary, then bisects the last step:
+```
+    start, start + 1, start + 3, start + 7, ... (galloping)
+    ... then bisection between the last two probes.
+```
+The probe of the boundary and, unless the boundary is `start`, the probe of
+the size right below it are always performed.
+
+With a `width` above 1, the search is speculative: the next `width` sizes
+(galloping steps, or sizes splitting the bisected range evenly) are probed
+at the same time. Once the first of them holding the predicate is known, the
+probes of the larger sizes are no longer needed and are cancelled, which
+kills their compiler and simulator processes.
+"""
+
+import asyncio
+
+
+class BoundarySearch:
+    def __init__(self, probe, start=1, limit=1023, width=1):
+        # Coroutine testing a size. Returns a `(holds, result)` tuple, where
+        # `holds` is the value of the predicate and `result` anything the
+        # analyzer needs from the probe.
+        self.probe = probe
+        self.start = start
+        # The largest size probed, in case the predicate never holds.
+        self.limit = limit
+        # Number of sizes probed at the same time.
+        self.width = width
+        self.results = {}
+
+    # Probe the size `n` (once) and return the value of the predicate.
+    async def test(self, n):
+        if n not in self.results:
+            self.results[n] = await self.probe(n)
+        return self.results[n][0]
+
+    # Result returned by the probe of the size `n`.
+    def result(self, n):
+        return self.results[n][1]
+
+    # Sizes probed so far, in increasing order.
+    def probed(self):
+        return sorted(self.results)
+
+    # Probe the increasing `sizes` at the same time, `low` being the largest
+    # size known to be below the boundary. Returns the first size holding the
+    # predicate (None if none does) and the updated `low`. The probes of the
+    # sizes after the first one holding the predicate are cancelled.
+    async def test_sizes(self, sizes, low):
+        tasks = [asyncio.ensure_future(self.test(n)) for n in sizes]
+        try:
+            for n, task in zip(sizes, tasks):
+                if await task:
+                    return n, low
+                low = n
+            return None, low
+        finally:
+            for task in tasks:
+                task.cancel()
+            # Wait for the cancelled probes to stop their processes.
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    # Returns the boundary, or None if the predicate does not hold up to
+    # `limit` (included).
+    async def run(self):
+        # Largest size known to be below the boundary.
+        low = self.start - 1
+        # Next galloping size, and the step following it.
+        size, step = self.start, 1
+        high = None
+        while high is None:
+            if low == self.limit:
+                return None
+            sizes = []
+            while len(sizes) < self.width and size not in sizes:
+                sizes.append(size)
+                size, step = min(size + step, self.limit), step * 2
+            high, low = await self.test_sizes(sizes, low)
+
+        # The boundary is in (low, high].
+        while high - low > 1:
+            # Sizes splitting the range evenly.
+            count = min(self.width, high - low - 1)
+            sizes = [
+                low + (high - low) * i // (count + 1)
+                for i in range(1, count + 1)
+            ]
+            found, low = await self.test_sizes(sizes, low)
+            if found is not None:
+                high = found
+
+        return high
@@ -0,0 +1,108 @@
+#! /bin/env python
+# Copyright 2025-present, Synopsys, Inc.
+# All rights reserved.
+#
+# This source code is licensed under the GPL-3.0 license found in
+# the LICENSE file in the root directory of this source tree.
+
+"""
+Building and simulating a program takes much longer than running the test
+it contains. A batch groups many independent test cases into a single
+program, so that it is compiled, linked and simulated once.
+
+Every test case stays a separate translation unit. Its `main` function is
+renamed, and called by a generated dispatcher, which prints a marker before
+each test case:
+```c
+    // Test case 0 (first translation unit)
+    #define main abi_case_0_main
+    ...
+    int main(void) {
+        callee(...);
+    }
+
+    // Dispatcher (last translation unit)
+    extern int abi_case_0_main(void);
+    ...
+    int main(void) {
+        printf("// Case 0\n");
+        abi_case_id = 0;
+        abi_clear_stack();
+        abi_case_0_main();
+        ...
+    }
+```
+Test cases must not define other global symbols, those have to be `static`.
+The stack is cleared before each test case, so that a dump only shows the
+values of its own test case. Values left in registers by the previous test
+cases are told apart by using unique values across the whole batch.
+"""
+
+CASE_MARKER = "// Case "
+
+
+# Rename the `main` function of the test case `index`.
+def prepare_case(index, src):
+    return f"#define main abi_case_{index}_main\n" + src
+
+
+class DispatcherGenerator:
+    def __init__(self, count):
+        self.Result = []
+        self.count = count
+
+    def append(self, W):
+        self.Result.append(W)
+
+    def get_result(self):
+        return "\n".join(self.Result)
+
+    def generate_prototypes(self):
+        self.append("#include <stdio.h>\n")
+        for index in range(self.count):
+            self.append(f"extern int abi_case_{index}_main(void);")
+        # Identifier of the running test case, see "src/helper.c".
+        self.append("extern unsigned abi_case_id;")
+
+    def generate_clear_stack(self):
+        self.append(
+            """
+static void __attribute__((noinline)) abi_clear_stack(void) {
+    volatile unsigned char buffer[4096];
+    for (unsigned i = 0; i < sizeof(buffer); ++i)
+        buffer[i] = 0;
+}
+"""
+        )
+
+    def generate_main(self):
+        self.append("int main(void) {")
+        for index in range(self.count):
+            self.append(f'    printf("{CASE_MARKER}{index}\\n");')
+            self.append(f"    abi_case_id = {index};")
+            self.append("    abi_clear_stack();")
+            self.append(f"    abi_case_{index}_main();")
+        self.append("    return 0;\n}")
+
+    def generate(self):
+        self.generate_prototypes()
+        self.generate_clear_stack()
+        self.generate_main()
+        return self.get_result()
+
+
+# Split the stdout of a batch into the stdout of each of its `count` test
+# cases. Returns None if a test case did not run (e.g. a crash).
+def split_cases(Content, count):
+    cases = []
+    for line in Content.splitlines(keepends=True):
+        if line.startswith(CASE_MARKER):
+            if line[len(CASE_MARKER) :].strip() != str(len(cases)):
+                return None
+            cases.append([])
+        elif cases:
+            cases[-1].append(line)
+
+    if len(cases) != count:
+        return None
+    return ["".join(case) for case in cases]
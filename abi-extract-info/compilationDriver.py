@@ -5,18 +5,159 @@
 # This source code is licensed under the GPL-3.0 license found in
 # the LICENSE file in the root directory of this source tree.
 
+import asyncio
+import contextlib
+import glob
 import os
-import subprocess
+import re
+import shutil
+import signal
+import tempfile
+import threading
+
+
+# Return the file descriptors of the in-memory files referenced by the
+# arguments of a command, so that they are inherited by the process.
+def pass_fds(c):
+    return [int(m.group(1)) for m in map(MEMFD_REGEX.match, c) if m]
+
+
+MEMFD_REGEX = re.compile(r"^/dev/fd/(\d+)$")
+
+# Directives of an assembly file naming the source file or the toolchain
+# version, and its comments (outside of strings).
+ASM_IDENT_REGEX = re.compile(rb"^\s*\.(ident|file)\b")
+ASM_COMMENT_REGEX = re.compile(rb'("(?:\\.|[^"\\])*")|\s*#.*$')
+
+
+# The assembly `content` generated by the compiler, without what only depends
+# on the toolchain version or on the file names (`.ident` and `.file`
+# directives, comments and blank lines).
+def normalize_assembly(content):
+    lines = []
+    for line in content.splitlines():
+        if ASM_IDENT_REGEX.match(line):
+            continue
+        line = ASM_COMMENT_REGEX.sub(lambda m: m.group(1) or b"", line)
+        if line.strip():
+            lines.append(line.rstrip())
+    return b"\n".join(lines)
+
+
+class MemoryFiles:
+    """
+    Anonymous in-memory files (see memfd_create(2)) that can be handed to the
+    toolchain and the simulator through their "/dev/fd/<N>" path. They are
+    released when leaving the `with` block.
+    """
+
+    def __init__(self):
+        self.fds = []
+
+    @staticmethod
+    def is_supported():
+        return hasattr(os, "memfd_create") and os.path.isdir("/dev/fd")
+
+    def create(self, name, content=None):
+        fd = os.memfd_create(name)
+        self.fds.append(fd)
+        if content is not None:
+            os.write(fd, content.encode())
+        return f"/dev/fd/{fd}"
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        for fd in self.fds:
+            os.close(fd)
+        self.fds = []
 
 
 class CompilationDriver:
-    def __init__(self, is_verbose, cc_path, sim_path):
+    """
+    Builds and simulates the test programs.
+
+    The processes are spawned by coroutines (`compileAsync`, `runAsync`, ...)
+    running on an event loop owned by the driver, at most `jobs` of them at
+    once. Each coroutine has a blocking counterpart with the same name
+    without the `Async` suffix, which can be called from the analyzers.
+    """
+
+    def __init__(
+        self,
+        is_verbose,
+        cc_path,
+        sim_path,
+        cache=None,
+        save_temps=False,
+        single_invocation=False,
+        pipe=False,
+        jobs=1,
+        tmp="tmp/",
+        batch=False,
+        speculate=1,
+        binary_dump=False,
+        seed=None,
+        results=None,
+        archive=None,
+        trace=None,
+    ):
         self.cc = str(cc_path / "cc-wrapper")
         self.assembler = str(cc_path / "as-wrapper")
         self.linker = str(cc_path / "ld-wrapper")
         self.simulator = str(sim_path / "sim-wrapper")
         self.cflags = ["-O1"]
+        # The dumps of "src/helper.c" are written as binary records, see
+        # `dumpInformation.read_binary`. The stdout of the simulations is then
+        # decoded byte per byte.
+        self.encoding = "utf-8"
+        if binary_dump:
+            self.cflags.append("-DABI_BINARY_DUMP")
+            self.encoding = "latin-1"
         self.is_verbose = is_verbose
+        # Optional `artifactCache.ArtifactCache` for compile/assemble outputs.
+        self.cache = cache
+        self.fingerprints = {}
+        # Optional `resultCache.ResultCache` for the analyzer results.
+        self.results = results
+        # Optional `runArchive.RunArchive` recording or replaying the runs.
+        self.archive = archive
+        # Optional `traceRecorder.TraceRecorder` recording the processes.
+        self.trace = trace
+        # Prebuilt runtime objects, see `runtime()`.
+        self.runtimes = {}
+        self.save_temps = save_temps
+        # Build each test with a single compiler invocation, see `build()`.
+        self.single_invocation = single_invocation
+        # Keep the generated sources and the intermediate files of the tests
+        # in memory instead of the workspace. Temporary files are still
+        # written with `--save-temps`, so that they can be inspected.
+        self.pipe = pipe and not save_temps and MemoryFiles.is_supported()
+        # Let the analyzers build independent test cases as a single program
+        # where they support it, see `Analyzer.generate_batch`.
+        self.batch = batch
+        # Number of sizes the boundary searches of the analyzers probe at the
+        # same time, see `boundarySearch.BoundarySearch`.
+        self.speculate = speculate
+        # Seed of the values of the tests (None for random values), see
+        # `Analyzer.value_generator`.
+        self.seed = seed
+        # Maximum number of processes running at the same time.
+        self.jobs = jobs
+        self.semaphore = None
+        # Processes currently running.
+        self.processes = set()
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(
+            target=self.loop.run_forever, name="driver", daemon=True
+        )
+        self.thread.start()
+        # Every run gets its own workspace in `tmp`, so that concurrent runs
+        # never share files. Each test gets its own directory in it, see
+        # `runAsync()`. The workspace is removed as a whole by `close()`.
+        os.makedirs(tmp, exist_ok=True)
+        self.workspace = tempfile.mkdtemp(prefix="run-", dir=tmp)
 
     def isWindows(self):
         return False  # For now, later on, we can also support windows
@@ -24,95 +165,571 @@ class CompilationDriver:
     def info(self, W):
         print("%s" % W)
 
+    # Run the coroutine `coro` on the event loop and wait for its result.
+    # Must not be called from a coroutine, use `await` there instead.
+    def wait(self, coro):
+        if threading.current_thread() is self.thread:
+            coro.close()
+            raise RuntimeError("blocking call from a driver coroutine")
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    # Run the coroutines concurrently and wait for all of their results,
+    # returned in the same order. If one of them fails, the others are
+    # cancelled and the exception is raised.
+    def waitAll(self, coros):
+        return self.wait(self.gather(coros))
+
+    async def gather(self, coros):
+        tasks = [asyncio.ensure_future(coro) for coro in coros]
+        try:
+            return await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    # Stop the event loop and remove the workspace, unless `--save-temps`
+    # is given. The driver cannot be used afterwards.
+    def close(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        # Processes left behind by an interrupted run.
+        for process in list(self.processes):
+            self.kill(process)
+        self.loop.close()
+        if self.archive is not None:
+            self.archive.close()
+        if self.trace is not None:
+            self.trace.close()
+        if self.save_temps:
+            print(f"Temporary files kept in {self.workspace}")
+        else:
+            shutil.rmtree(self.workspace, ignore_errors=True)
+
+    # Create a new directory in the workspace (or in `tmp`).
+    def directory(self, prefix, tmp=None):
+        return tempfile.mkdtemp(prefix=prefix, dir=tmp or self.workspace)
+
+    # Kill `process` and the processes it started, e.g. the simulator run
+    # by a wrapper script. Each process is started in its own group.
+    def kill(self, process):
+        try:
+            if self.isWindows():
+                process.kill()
+            else:
+                os.killpg(process.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+    # Record a span of `kind` (see `traceRecorder.py`) around the body of the
+    # `with` statement, if the run is traced. Its arguments can be completed
+    # in the body.
+    def span(self, kind, name, args=None):
+        if self.trace is None:
+            return contextlib.nullcontext(dict(args or {}))
+        return self.trace.span(kind, name, args)
+
+    # Name of the step run by the command `c` in a trace.
+    def step(self, c):
+        if "--version" in c:
+            return "identify"
+        if c[0] == self.cc:
+            return "compile" if "-S" in c else "build"
+        if c[0] == self.assembler:
+            return "assemble"
+        if c[0] == self.linker:
+            return "link"
+        if c[0] == self.simulator:
+            return "simulate"
+        return os.path.basename(c[0])
+
+    # Size of the output file of the command `c` (given by "-o"), if any.
+    def outputSize(self, c):
+        if "-o" not in c[:-1]:
+            return None
+        try:
+            return os.path.getsize(c[c.index("-o") + 1])
+        except OSError:
+            return None
+
+    # Spawn `c` once a job slot is available and wait for it to finish.
+    # The process (and its children) is killed if the calling coroutine is
+    # cancelled. Returns its stdout (if captured) and its return code.
+    async def execute(self, c, stdout, stderr, env):
+        # Created on first use, to belong to the event loop of the driver.
+        if self.semaphore is None:
+            self.semaphore = asyncio.Semaphore(self.jobs)
+        async with self.semaphore:
+            if self.is_verbose:
+                self.info("EXECUTING: %s" % (" ".join(c)))
+            command = {"command": " ".join(c)}
+            with self.span("processes", self.step(c), command) as args:
+                process = await asyncio.create_subprocess_exec(
+                    *c,
+                    stdout=stdout,
+                    stderr=stderr,
+                    env=env,
+                    pass_fds=pass_fds(c),
+                    start_new_session=not self.isWindows(),
+                )
+                self.processes.add(process)
+                try:
+                    output, _ = await process.communicate()
+                except asyncio.CancelledError:
+                    self.kill(process)
+                    await process.wait()
+                    raise
+                finally:
+                    self.processes.discard(process)
+                if self.trace is not None:
+                    args["exit_code"] = process.returncode
+                    args["stdout_bytes"] = len(output or b"")
+                    args["output_bytes"] = self.outputSize(c)
+            return output, process.returncode
+
     # c: an array of arguments. The first element is the program to execute.
-    def cmd(self, c, stdout=None, stderr=None, env=None):
+    async def cmdAsync(self, c, stdout=None, stderr=None, env=None):
         if self.isWindows() and c[0] == "bash":
             c = [c[0], "-o", "igncr"] + c[1:]
         # If the verbose flag (-v) is detected, executed commands will be
         # displayed along with their stdout and stderr outputs.
-        if self.is_verbose:
-            self.info("EXECUTING: %s" % (" ".join(c)))
-            return subprocess.call(c, stdout=stdout, stderr=stderr, env=env)
-        else:
-            return subprocess.call(
-                c, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=env
-            )
+        if not self.is_verbose:
+            stdout = stderr = asyncio.subprocess.DEVNULL
+        _, return_code = await self.execute(c, stdout, stderr, env)
+        return return_code
+
+    def cmd(self, c, stdout=None, stderr=None, env=None):
+        return self.wait(self.cmdAsync(c, stdout, stderr, env))
 
     # c: an array of arguments. The first element is the program to execute.
     # Returns the output
-    def cmdWithResult(self, c, errorMsg=None, env=None):
+    async def cmdWithResultAsync(self, c, errorMsg=None, env=None):
         try:
             # If the verbose flag (-v) is detected, executed commands will be displayed.
-            if self.is_verbose:
-                self.info("EXECUTING: %s" % (" ".join(c)))
-                process = subprocess.Popen(c, stdout=subprocess.PIPE)
-            else:
-                process = subprocess.Popen(
-                    c, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
-                )
-            stdout, stderr = process.communicate()
-            return stdout, process.returncode
+            stderr = None if self.is_verbose else asyncio.subprocess.DEVNULL
+            return await self.execute(c, asyncio.subprocess.PIPE, stderr, env)
         except OSError as oserror:
             return None, 1
 
+    def cmdWithResult(self, c, errorMsg=None, env=None):
+        return self.wait(self.cmdWithResultAsync(c, errorMsg, env))
+
+    # Path of the intermediate file `name`, either in `tmp` (the workspace
+    # by default) or in memory.
+    def outputPath(self, name, tmp=None, memory=None):
+        if memory is not None:
+            return memory.create(name)
+        return os.path.join(tmp or self.workspace, name)
+
+    # Write a generated source to the file `name`, either in `tmp` (the
+    # workspace by default) or in memory.
+    def sourcePath(self, src, name, tmp=None, memory=None):
+        if memory is not None:
+            return memory.create(name, src)
+        path = self.outputPath(name, tmp)
+        with open(path, "w") as file:
+            file.write(src)
+        return path
+
+    # Compile a source into an assembly file. Returns the assembly file, or
+    # None if the compilation failed.
+    async def assemblyAsync(self, srcFile, tmp=None, memory=None):
+        asmFile = os.path.basename(srcFile)
+        asmFile = asmFile.replace(".c", ".s")
+        asmFile = self.outputPath(asmFile, tmp, memory)
+        res = await self.compileAsync(srcFile, asmFile)
+        if res != 0:
+            return None
+        return asmFile
+
+    # Compile the sources into assembly files, concurrently. Returns the list
+    # of assembly files, or None if any compilation failed.
+    async def assembliesAsync(self, srcFiles, tmp=None, memory=None):
+        asmFiles = await asyncio.gather(
+            *[self.assemblyAsync(f, tmp, memory) for f in srcFiles]
+        )
+        if None in asmFiles:
+            return None
+        return list(asmFiles)
+
+    # Compile (if `isSource`) and assemble a file into an object file.
+    # Returns the object file, or None if any step failed.
+    async def objectAsync(self, srcFile, isSource, tmp=None, memory=None):
+        asmFile = srcFile
+        if isSource:
+            asmFile = await self.assemblyAsync(srcFile, tmp, memory)
+            if asmFile is None:
+                return None
+
+        objFile = os.path.basename(asmFile)
+        objFile = objFile.replace(".s", ".o")
+        objFile = objFile.replace(".S", ".o")
+        objFile = self.outputPath(objFile, tmp, memory)
+        res = await self.assembleAsync(asmFile, objFile)
+        if res != 0:
+            return None
+        return objFile
+
+    # Compile and assemble the sources into object files, concurrently.
+    # Returns the list of object files, or None if any step failed.
+    async def objectsAsync(self, srcFiles, asmFiles, tmp=None, memory=None):
+        objFiles = await asyncio.gather(
+            *[self.objectAsync(f, False, tmp, memory) for f in asmFiles],
+            *[self.objectAsync(f, True, tmp, memory) for f in srcFiles],
+        )
+        if None in objFiles:
+            return None
+        return list(objFiles)
+
+    def objects(self, srcFiles, asmFiles, tmp=None, memory=None):
+        return self.wait(self.objectsAsync(srcFiles, asmFiles, tmp, memory))
+
+    # The runtime (e.g "src/helper.c" and "src/arch/riscv.S") is the same for
+    # every test program. It is built once per (cc wrapper, cflags) pair into
+    # a partially linked relocatable, which every test is then linked with.
+    # Returns the list of object files to link with, or None on failure.
+    async def runtimeAsync(self, runtimeFiles, tmp=None):
+        objFiles, _ = await self.runtimeBuildAsync(runtimeFiles, tmp)
+        return objFiles
+
+    def runtime(self, runtimeFiles, tmp=None):
+        return self.wait(self.runtimeAsync(runtimeFiles, tmp))
+
+    # The assembly of the runtime (normalized, see `normalize_assembly`).
+    async def runtimeAssemblyAsync(self, runtimeFiles, tmp=None):
+        _, assembly = await self.runtimeBuildAsync(runtimeFiles, tmp)
+        return assembly
+
+    # Returns the object files and the assembly of the runtime.
+    async def runtimeBuildAsync(self, runtimeFiles, tmp=None):
+        if not runtimeFiles:
+            return [], []
+
+        key = (self.cc, tuple(self.cflags), tuple(runtimeFiles))
+        if key not in self.runtimes:
+            # Concurrent tests wait for the same build.
+            self.runtimes[key] = asyncio.ensure_future(
+                self.buildRuntimeAsync(
+                    runtimeFiles, self.directory("runtime-", tmp)
+                )
+            )
+
+        return await asyncio.shield(self.runtimes[key])
+
+    # Build the runtime in the directory `tmp`.
+    async def buildRuntimeAsync(self, runtimeFiles, tmp):
+        srcFiles = [f for f in runtimeFiles if f.endswith(".c")]
+        asmFiles = [f for f in runtimeFiles if not f.endswith(".c")]
+        srcAsmFiles = await self.assembliesAsync(srcFiles, tmp)
+        if srcAsmFiles is None:
+            return None, None
+        assembly = self.readAssemblies(srcAsmFiles, asmFiles)
+        objFiles = await self.objectsAsync([], asmFiles + srcAsmFiles, tmp)
+        if objFiles is None:
+            return None, None
+
+        outputFile = os.path.join(tmp, "runtime.o")
+        res = await self.cmdAsync(
+            [self.linker]
+            + self.cflags
+            + ["-r", "-nostdlib"]
+            + objFiles
+            + ["-o", outputFile]
+        )
+        # Not every linker supports partial linking, fall back to
+        # linking the runtime objects individually.
+        return ([outputFile] if res == 0 else objFiles), assembly
+
+    # The contents of the assembly files generated by the compiler
+    # `srcAsmFiles` (normalized, see `normalize_assembly`), and of the
+    # assembly sources `asmFiles`.
+    def readAssemblies(self, srcAsmFiles, asmFiles):
+        contents = []
+        for asmFile in srcAsmFiles + asmFiles:
+            with open(asmFile, "rb") as file:
+                contents.append(file.read())
+        return [
+            normalize_assembly(content)
+            for content in contents[: len(srcAsmFiles)]
+        ] + contents[len(srcAsmFiles) :]
+
+    # Key of the stdout of a program in the artifact cache, made of its
+    # assembly (see `readAssemblies`) and the one of its runtime. A program
+    # whose assembly did not change since a previous run, e.g after a
+    # compiler upgrade, gets the stdout of that run back instead of being
+    # assembled, linked and simulated again. The stdout also depends on the
+    # assembler and on the linker (and the crt/libc it links in, e.g for
+    # `printf`), which are part of the key as well.
+    async def simulationKeyAsync(self, srcAsmFiles, asmFiles, runtimeFiles):
+        if self.cache is None:
+            return None
+        return self.cache.key(
+            "simulation",
+            await self.fingerprintAsync(self.assembler),
+            await self.fingerprintAsync(self.linker),
+            await self.fingerprintAsync(self.simulator),
+            " ".join(self.cflags),
+            *await self.runtimeAssemblyAsync(runtimeFiles),
+            *self.readAssemblies(srcAsmFiles, asmFiles),
+        )
+
     # Compile, assemble, link and simulate wrapper to reduce extensive code.
-    def run(self, srcFiles, asmFiles, outFile, tmp="tmp/"):
-        asm_files = asmFiles.copy()
-        for srcFile in srcFiles:
-            asmFile = tmp + os.path.basename(srcFile)
-            asmFile = asmFile.replace(".c", ".s")
-            res = self.compile(srcFile, asmFile)
-            if res != 0:
-                return 1, None
-            asm_files.append(asmFile)
-
-        objFiles = []
-        for asmFile in asm_files:
-            objFile = tmp + os.path.basename(asmFile)
-            objFile = objFile.replace(".s", ".o")
-            objFile = objFile.replace(".S", ".o")
-            res = self.assemble(asmFile, objFile)
+    # `sources` is a list of strings containing generated C sources.
+    # The files of the test are written to a new directory in `tmp` (the
+    # workspace by default), unless they are kept in memory.
+    # Returns the return code and the stdout of the simulation.
+    async def runAsync(
+        self,
+        srcFiles,
+        asmFiles,
+        outFile,
+        tmp=None,
+        runtimeFiles=None,
+        sources=None,
+    ):
+        # Replay the run of the test, or record it, see `runArchive.py`.
+        archiveKey = None
+        if self.archive is not None:
+            archiveKey = self.archive.key(
+                outFile,
+                (runtimeFiles or []) + srcFiles + asmFiles,
+                sources or [],
+                self.cflags,
+            )
+            if self.archive.replay:
+                Content = self.archive.lookup(archiveKey)
+                if Content is None:
+                    self.info(f"'{outFile}' test not found in the archive.")
+                    return 1, None
+                return 0, Content
+
+        runtimeObjFiles = await self.runtimeAsync(runtimeFiles)
+        if runtimeObjFiles is None:
+            return 1, None
+
+        with MemoryFiles() as memory:
+            if self.pipe:
+                job = None
+            else:
+                memory = None
+                job = self.directory(outFile + "-", tmp)
+
+            srcFiles = srcFiles + [
+                self.sourcePath(src, f"{outFile}{index}.c", job, memory)
+                for index, src in enumerate(sources or [])
+            ]
+
+            outputFile = self.outputPath(outFile + ".elf", job, memory)
+
+            if self.single_invocation:
+                res = await self.buildAsync(
+                    srcFiles + asmFiles + runtimeObjFiles, outputFile
+                )
+                if res != 0:
+                    return 1, None
+                Content, res = await self.simulateWithResultAsync(outputFile)
+            else:
+                srcAsmFiles = await self.assembliesAsync(srcFiles, job, memory)
+                if srcAsmFiles is None:
+                    return 1, None
+
+                key = await self.simulationKeyAsync(
+                    srcAsmFiles, asmFiles, runtimeFiles
+                )
+                Content = self.cache.get(key) if key else None
+                if Content is not None:
+                    Content, res = Content.decode(self.encoding), 0
+                else:
+                    Content, res = await self.linkAndSimulateAsync(
+                        runtimeObjFiles,
+                        asmFiles + srcAsmFiles,
+                        outputFile,
+                        job,
+                        memory,
+                    )
+                    if key and res == 0:
+                        self.cache.put(key, Content.encode(self.encoding))
+
             if res != 0:
                 return 1, None
-            objFiles.append(objFile)
 
-        outputFile = tmp + outFile + ".elf"
-        res = self.link(objFiles, outputFile)
-        if res != 0:
-            return 1, None
+            if archiveKey is not None:
+                self.archive.record(
+                    archiveKey, outFile, sources or [], outputFile, Content
+                )
+
+        if memory is None:
+            stdoutFile = os.path.join(job, outFile + ".stdout")
+            with open(stdoutFile, "w", encoding=self.encoding) as file:
+                file.write(Content)
+
+        return 0, Content
+
+    # Assemble `asmFiles`, link them with the runtime into `outputFile` and
+    # simulate it. Returns the stdout of the simulation and its return code.
+    async def linkAndSimulateAsync(
+        self, runtimeObjFiles, asmFiles, outputFile, tmp=None, memory=None
+    ):
+        objFiles = await self.objectsAsync([], asmFiles, tmp, memory)
+        if objFiles is None:
+            return None, 1
 
-        stdoutFile = tmp + outFile + ".stdout"
-        res = self.simulate("", outputFile, stdoutFile)
+        res = await self.linkAsync(runtimeObjFiles + objFiles, outputFile)
         if res != 0:
-            return 1, None
+            return None, 1
+
+        return await self.simulateWithResultAsync(outputFile)
+
+    def run(
+        self,
+        srcFiles,
+        asmFiles,
+        outFile,
+        tmp=None,
+        runtimeFiles=None,
+        sources=None,
+    ):
+        return self.wait(
+            self.runAsync(
+                srcFiles, asmFiles, outFile, tmp, runtimeFiles, sources
+            )
+        )
+
+    # Identify the toolchain behind a wrapper by the contents of the
+    # wrapper script and the version reported by the tool it resolves to.
+    async def fingerprintAsync(self, tool):
+        if tool not in self.fingerprints:
+            self.fingerprints[tool] = asyncio.ensure_future(
+                self.identifyAsync(tool)
+            )
+        return await asyncio.shield(self.fingerprints[tool])
+
+    def fingerprint(self, tool):
+        return self.wait(self.fingerprintAsync(tool))
+
+    async def identifyAsync(self, tool):
+        with open(tool, "rb") as file:
+            content = file.read()
+        version, _ = await self.cmdWithResultAsync([tool, "--version"])
+        return content + (version or b"")
+
+    # Run the `tool` command `c` producing `OutputFile` out of `InputFile`,
+    # or fetch the output from the artifact cache when it was produced
+    # before with the same toolchain, flags and source.
+    async def cachedCmdAsync(self, tool, mode, c, InputFile, OutputFile):
+        if self.cache is None:
+            return await self.cmdAsync(c)
+
+        # Headers next to the source can be included by it (e.g
+        # "src/stack_dir/A.h"), so they are part of the key as well.
+        sources = [InputFile] + sorted(
+            glob.glob(os.path.join(os.path.dirname(InputFile), "*.h"))
+        )
+        contents = []
+        for source in sources:
+            with open(source, "rb") as file:
+                contents.append(file.read())
+
+        key = self.cache.key(
+            await self.fingerprintAsync(tool),
+            " ".join(self.cflags),
+            mode,
+            *contents,
+        )
+        if self.cache.lookup(key, OutputFile):
+            return 0
+
+        res = await self.cmdAsync(c)
+        if res == 0:
+            self.cache.store(key, OutputFile)
+        return res
 
-        return 0, stdoutFile
+    # In-memory files have no suffix to deduce their language from.
+    def language(self, InputFile, language):
+        if MEMFD_REGEX.match(InputFile):
+            return ["-x", language, InputFile, "-x", "none"]
+        return [InputFile]
 
     # Compiler the specified program into an object file
+    async def compileAsync(self, InputFile, OutputFile):
+        return await self.cachedCmdAsync(
+            self.cc,
+            "-S",
+            [self.cc]
+            + self.cflags
+            + self.language(InputFile, "c")
+            + ["-S", "-o", OutputFile],
+            InputFile,
+            OutputFile,
+        )
+
     def compile(self, InputFile, OutputFile):
-        return self.cmd(
-            [self.cc] + self.cflags + [InputFile, "-S", "-o", OutputFile]
+        return self.wait(self.compileAsync(InputFile, OutputFile))
+
+    async def assembleAsync(self, InputFile, OutputFile):
+        return await self.cachedCmdAsync(
+            self.assembler,
+            "-c",
+            [self.assembler]
+            + self.cflags
+            + self.language(InputFile, "assembler")
+            + ["-c", "-o", OutputFile],
+            InputFile,
+            OutputFile,
         )
 
     def assemble(self, InputFile, OutputFile):
-        return self.cmd(
-            [self.assembler] + self.cflags + [InputFile, "-c", "-o", OutputFile]
-        )
+        return self.wait(self.assembleAsync(InputFile, OutputFile))
 
     # Initialy, only one input file was needed, but now multiple files are required
     # for expanded tests. A mechanism was added to handle multiple files, converting
     # a single file into a list of necessary.
-    def link(self, InputFile, OutputFile):
+    async def linkAsync(self, InputFile, OutputFile):
         if isinstance(InputFile, str):
             InputFile = [InputFile]
-        return self.cmd(
+        return await self.cmdAsync(
             [self.linker] + self.cflags + InputFile + ["-o", OutputFile]
         )
 
-    def simulate(self, args, InputFile, OutputFile):
-        Content, return_code = self.cmdWithResult(
+    def link(self, InputFile, OutputFile):
+        return self.wait(self.linkAsync(InputFile, OutputFile))
+
+    # Compile, assemble and link the sources (and objects) into an executable
+    # with a single invocation of the compiler driver. The intermediate
+    # assembly is only kept with `--save-temps`.
+    async def buildAsync(self, InputFiles, OutputFile):
+        save_temps = ["-save-temps=obj"] if self.save_temps else []
+        InputFiles = [
+            arg
+            for InputFile in InputFiles
+            for arg in self.language(InputFile, "c")
+        ]
+        return await self.cmdAsync(
+            [self.cc]
+            + self.cflags
+            + save_temps
+            + InputFiles
+            + ["-o", OutputFile]
+        )
+
+    def build(self, InputFiles, OutputFile):
+        return self.wait(self.buildAsync(InputFiles, OutputFile))
+
+    # Returns the stdout of the simulation and its return code.
+    async def simulateWithResultAsync(self, InputFile):
+        Content, return_code = await self.cmdWithResultAsync(
             [self.simulator] + [InputFile]
         )
-        Content = Content.decode()
-        open(OutputFile, "w").write(Content)
+        if Content is None:
+            return None, return_code
+        return Content.decode(self.encoding), return_code
+
+    def simulateWithResult(self, InputFile):
+        return self.wait(self.simulateWithResultAsync(InputFile))
+
+    async def simulateAsync(self, args, InputFile, OutputFile):
+        Content, return_code = await self.simulateWithResultAsync(InputFile)
+        open(OutputFile, "w", encoding=self.encoding).write(Content or "")
         return return_code
+
+    def simulate(self, args, InputFile, OutputFile):
+        return self.wait(self.simulateAsync(args, InputFile, OutputFile))
@@ -5,15 +5,45 @@
 # This source code is licensed under the GPL-3.0 license found in
 # the LICENSE file in the root directory of this source tree.
 
+import struct
+
+import valueIndex
+
+# Binary dump records are written by "src/helper.c" when it is built with
+# `-DABI_BINARY_DUMP` (see `--binary-dump`), instead of the text dump.
+BINARY_MAGIC = struct.pack("<I", 0x444241AB)
+# The magic as found in a stdout decoded as "latin-1".
+BINARY_MAGIC_TEXT = BINARY_MAGIC.decode("latin-1")
+# magic, case id, size of stack entry, number of register banks, current
+# stack.
+BINARY_HEADER = struct.Struct("<IIIIQ")
+# foreach register bank: size of register, number of registers.
+BINARY_BANK = struct.Struct("<II")
+# Number of stack entries dumped.
+STACK_ENTRIES = 32
+# `struct` formats of the register and stack words, by size.
+WORD_FORMATS = {1: "B", 2: "H", 4: "I", 8: "Q"}
+
+
+# The register banks and the stack of a dump, which carry the index of the
+# values of the dump, see `valueIndex.index_of`.
+class RegisterBanks(dict):
+    value_index = None
+
+
+class StackEntries(list):
+    value_index = None
+
 
 class DumpInformation:
     def __init__(self):
+        self.case_id = 0
         self.stack_ptr = ""
         self.stack_ptr_size = 0
         self.reg_bank_count = 0
         self.reg_bank_infos = {}
-        self.RegBanks = {}
-        self.Stack = []
+        self.RegBanks = RegisterBanks()
+        self.Stack = StackEntries()
 
     def get_reg_bank_count(self):
         return self.reg_bank_count
@@ -27,30 +57,8 @@ class DumpInformation:
     def get_stack(self):
         return self.Stack
 
-    def read_file(self, file_name):
-        with open(file_name, "r") as file:
-            return file.read().splitlines()
-
     # Read Header from the "dump_information" provided by "src/helper.c"
-    def read_header(self, content):
-        if "// Header info" not in content[0]:
-            #            return content
-            return self.read_header(content[1:])
-
-
-        # Delete comment - "// Header info"
-        content.pop(0)
-
-        # FIXME Use "take while" if it exists.
-        header_lines = []
-        while content:
-            Content = content[0]
-            if "//" in Content:
-                break
-
-            Content = content.pop(0)
-            header_lines.append(Content)
-
+    def read_header(self, header_lines):
         assert len(header_lines) >= 6
 
         # header structure:
@@ -71,79 +79,187 @@ class DumpInformation:
             reg_bank_info["nr"] = int(header_lines[i + 2], 16)
             self.reg_bank_infos[bank_id] = reg_bank_info
 
-        return content
-
-    # Read Register Banks from the "dump_information" provided by "src/helper.c"
-    def read_reg_banks(self, content):
-        if "// regs_bank" not in content[0]:
-            return content
-
-        # Pop comment - "// regs_bank"
-        reg_bank = content.pop(0)
-        # Delete `// `
-        reg_bank = reg_bank[3:]
-        self.RegBanks[reg_bank] = list()
-
-        while content:
-            Content = content[0]
-            if "//" in Content:
-                if "// regs_bank" in Content:
-                    self.read_reg_banks(content)
-                    break
-                else:
-                    break
-
-            Content = content.pop(0)
-            self.RegBanks[reg_bank].append(Content)
-
-        return content
+    # Read a Register Bank from the "dump_information" provided by
+    # "src/helper.c"
+    def read_reg_bank(self, reg_bank, lines):
+        self.RegBanks[reg_bank] = lines
 
     # Read Stack dump from "dump_information" provided by "src/helper.c"
-    def read_stack(self, content):
-        if "// Start of stack dump" not in content[0]:
-            return content
-
-        # This is currently being discarded, should it?. FIXME
-        content.pop(0)
-
-        while content:
-            Content = content[0]
-            if "//" in Content:
+    def read_stack(self, lines):
+        for line in lines:
+            self.Stack.append(line.split(" : "))
+
+    # Index the values of the register banks and the stack, once the dump
+    # is read.
+    def build_index(self):
+        index = valueIndex.ValueIndex(self.RegBanks, self.Stack)
+        self.RegBanks.value_index = self.Stack.value_index = index
+
+    # Read the sections of the next dump from `sections`, see
+    # `read_sections()`, up to its "// Done". Returns False if there is no
+    # dump left.
+    def read_dump(self, sections):
+        found = False
+        for kind, name, lines in sections:
+            if kind == HEADER:
+                found = True
+                self.read_header(lines)
+            elif not found:
+                # Sections before the header are not part of the dump.
+                continue
+            elif kind == REG_BANK:
+                self.read_reg_bank(name, lines)
+            elif kind == STACK:
+                self.read_stack(lines)
+            elif kind == DONE:
                 break
 
-            Content = content.pop(0)
-            Content = Content.split(" : ")
-
-            self.Stack.append(Content)
-
-        return Content
-
-    # Split dump information from multiple dumps within a single C file.
-    # This occurs when there are multiple calls to the extern callee()
-    # function in a test case.
-    def split_dump_sections(self, StdoutFile):
-        Content = self.read_file(StdoutFile)
-        result = []
-        current_sublist = []
-
-        for c in Content:
-            if "// Done" in c:
-                result.append(current_sublist)
-                current_sublist = []
-            else:
-                current_sublist.append(c)
-
-        return result
+        if found:
+            self.build_index()
+        return found
 
+    # Parse the first dump of `lines`, any iterable of lines (e.g. a list,
+    # a file or a pipe), which is consumed up to the end of the dump.
     def parse_lines(self, lines):
-        lines = self.read_header(lines)
-        lines = self.read_reg_banks(lines)
-        lines = self.read_stack(lines)
-
-        return lines
+        self.read_dump(read_sections(lines))
+
+    # Read the `count` words of `size` bytes at `offset` of `view`.
+    def read_words(self, view, offset, size, count):
+        return struct.unpack_from(f"<{count}{WORD_FORMATS[size]}", view, offset)
+
+    # Read the binary dump record at `offset` of `data` (e.g the stdout of
+    # the simulation). The words are decoded in place, and stored as the
+    # same hexadecimal strings as the text dump. Returns the offset of the
+    # end of the record.
+    def read_binary(self, data, offset=0):
+        view = memoryview(data)
+        (
+            _,
+            self.case_id,
+            self.stack_ptr_size,
+            self.reg_bank_count,
+            self.stack_ptr,
+        ) = BINARY_HEADER.unpack_from(view, offset)
+        offset += BINARY_HEADER.size
+
+        for index in range(self.reg_bank_count):
+            size, nr = BINARY_BANK.unpack_from(view, offset)
+            offset += BINARY_BANK.size
+            self.reg_bank_infos[f"regs_bank{index}"] = {"size": size, "nr": nr}
+
+        for bank_id, reg_bank_info in self.reg_bank_infos.items():
+            size, nr = reg_bank_info["size"], reg_bank_info["nr"]
+            words = self.read_words(view, offset, size, nr)
+            offset += size * nr
+            self.RegBanks[bank_id] = [f"0x{word:x}" for word in words]
+
+        size = self.stack_ptr_size
+        words = self.read_words(view, offset, size, STACK_ENTRIES)
+        offset += size * STACK_ENTRIES
+        for index, word in enumerate(words):
+            address = self.stack_ptr + index * size
+            self.Stack.append([f"0x{address:x}", f"0x{word:x}"])
+
+        self.build_index()
+        return offset
 
     def parse(self, Content):
-        return self.parse_lines(Content.splitlines())
+        if is_binary(Content):
+            data = to_bytes(Content)
+            self.read_binary(data, data.find(BINARY_MAGIC))
+        else:
+            self.parse_lines(Content.splitlines())
+
+
+# Kinds of sections of the "dump_information" provided by "src/helper.c".
+HEADER = "header"
+REG_BANK = "reg_bank"
+STACK = "stack"
+DONE = "done"
+
+
+# Walk `lines` once and yield the sections of the dumps they contain, as
+# `(kind, name, lines)` tuples, e.g `(REG_BANK, "regs_bank0", [...])`. The
+# lines are consumed lazily, so that only the current section is kept in
+# memory. Lines outside of a section (e.g the output of the test) are
+# skipped.
+def read_sections(lines):
+    kind = name = None
+    section = []
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if "//" not in line:
+            if kind is not None:
+                section.append(line)
+            continue
+
+        # A comment ends the current section.
+        if kind is not None:
+            yield kind, name, section
+        kind = name = None
+        section = []
+
+        if "// Header info" in line:
+            kind = HEADER
+        elif "// regs_bank" in line:
+            # Delete `// `
+            kind, name = REG_BANK, line[3:]
+        elif "// Start of stack dump" in line:
+            kind = STACK
+        elif "// Done" in line:
+            yield DONE, None, section
+
+    if kind is not None:
+        yield kind, name, section
+
+
+# Parse every dump of `lines`, see `read_sections()`. Yields a
+# `DumpInformation` per dump, as soon as it is read.
+def read_dumps(lines):
+    sections = read_sections(lines)
+    while True:
+        dump_information = DumpInformation()
+        if not dump_information.read_dump(sections):
+            return
+        yield dump_information
+
+
+# Whether `Content` holds binary dump records, see `read_binary()`.
+def is_binary(Content):
+    if isinstance(Content, str):
+        return BINARY_MAGIC_TEXT in Content
+    return BINARY_MAGIC in Content
+
+
+# Whether `Content` holds a (text or binary) dump.
+def has_dump(Content):
+    return "// Header info" in Content or is_binary(Content)
+
+
+# The stdout of a simulation with binary dump records is decoded as "latin-1",
+# which maps every byte to a character and back.
+def to_bytes(Content):
+    if isinstance(Content, str):
+        return Content.encode("latin-1")
+    return Content
+
+
+# Parse every binary dump record of `data`. Yields a `DumpInformation` per
+# record.
+def read_binary_dumps(data):
+    offset = data.find(BINARY_MAGIC)
+    while offset != -1:
+        dump_information = DumpInformation()
+        offset = dump_information.read_binary(data, offset)
+        yield dump_information
+        offset = data.find(BINARY_MAGIC, offset)
+
+
+# Parse every dump of the stdout of a simulation, text or binary.
+def parse_dumps(Content):
+    if is_binary(Content):
+        return read_binary_dumps(to_bytes(Content))
+    return read_dumps(Content.splitlines())
 
 
 def get_reg_banks():
@@ -154,9 +270,5 @@ def get_stack(self):
     return DumpInformation().get_stack()
 
 
-def split_dump_sections(Content):
-    return DumpInformation().split_dump_sections(Content)
-
-
 def parse(Content, to_read=False):
     return DumpInformation().parse(Content, to_read)
@@ -5,7 +5,6 @@
 # This source code is licensed under the GPL-3.0 license found in
 # the LICENSE file in the root directory of this source tree.
 
-import os
 import pathlib
 
 
@@ -28,20 +27,6 @@ def read_file(file_name):
         return file.read()
 
 
-def cleanup(folder="tmp/"):
-    # Check if the folder exists
-    if os.path.exists(folder):
-        # Loop through the directory and remove contents
-        for filename in os.listdir(folder):
-            file_path = os.path.join(folder, filename)
-            try:
-                if os.path.isfile(file_path):
-                    # Remove file
-                    os.remove(file_path)
-            except Exception as e:
-                print(f"Failed to delete {file_path}. Reason: {e}")
-
-
 import re
 
 
@@ -107,71 +92,135 @@ def decimal_to_hex(decimal, width=2):
     return hex_str.zfill(width)
 
 
-def reset_used_values():
-    generate_binary_value.used_values = []
+import hashlib
+import random
 
+# Values drawn by `ValueGenerator.generate_int` before looking for the unused
+# values left, for sizes up to `MAX_ENUMERATED_SIZEOF` bits.
+MAX_DRAWS = 64
+MAX_ENUMERATED_SIZEOF = 16
 
-import random
 
+# Seed of a test case, derived from the seed of the run and the `keys`
+# identifying the test case (e.g the analyzer name, a datatype and a count).
+# None if the run is not seeded.
+def derive_seed(seed, *keys):
+    if seed is None:
+        return None
+    digest = hashlib.sha256(repr((seed,) + keys).encode()).digest()
+    return int.from_bytes(digest[:8], "little")
 
-def generate_binary_value(sizeof, replace_msb_by_one=False):
-    # Initialize static variable.
-    if not hasattr(generate_binary_value, "used_values"):
-        reset_used_values()
 
-    while True:
-        bvalue = "".join(random.choice("01") for _ in range(sizeof))
+class ValueGeneratorError(Exception):
+    """
+    This exception is raised when every value of a size has been generated.
+    """
 
-        # Certain cases we need the most significant bit
-        # to be set to one. (e.g, bitfields)
+
+# Generates the unique values of the test cases. Each analyzer (or job) uses
+# its own generator, so concurrent analyzers do not share the values already
+# used. Values are generated as integers, and only converted once accepted.
+class ValueGenerator:
+    def __init__(self, seed=None):
+        self.random = random.Random(seed)
+        self.used_values = set()
+
+    # Forget the values already used.
+    def reset(self):
+        self.used_values.clear()
+
+    # Number of distinct integers of `sizeof` bits `generate_int` generates,
+    # e.g 225 values of 8 bits (both nibbles are not 0).
+    @staticmethod
+    def capacity(sizeof, replace_msb_by_one=False):
         if replace_msb_by_one:
-            bvalue = "1" + bvalue[1:]
+            count = 1 << (sizeof - 1)
+        elif sizeof < 4:
+            return (1 << sizeof) - 1
+        else:
+            count = 15 << (sizeof - 4)
+        if sizeof >= 8:
+            count = count * 15 // 16
+        return count
+
+    # Whether the integer `value` of `sizeof` bits can be generated.
+    @staticmethod
+    def is_valid(value, sizeof):
+        # Shifts of the 4 most significant bits, and of the 4 bits after the
+        # middle of the value (as written, most significant bit first).
+        top_shift = sizeof - 4
+        middle_shift = sizeof - sizeof // 2 - 4
 
         # The generated value cannot:
         #   - be all zeros;
         #   - have the 4 most significant bits set to 0.
-        #   - have the middle 4 bits (in this case where sizeof >= 8 ) set to 0;
-        #   (Used when a value is split in two)
-        #   - be reused.
-        if (
-            (bvalue != "0" * sizeof)
-            and (sizeof < 4 or bvalue[:4] != "0000")
-            and (sizeof < 8 or bvalue[sizeof // 2 : sizeof // 2 + 4] != "0000")
-            and (bvalue not in generate_binary_value.used_values)
-        ):
-            # Append to used_values list.
-            generate_binary_value.used_values.append(bvalue)
-            return bvalue
-
-
-def generate_hexa_value(sizeof):
-    # The `sizeof`` represents the size of the value in hexadecimal.
-    # We need to convert this to the equivalent bit size.
-    # FIXME! This assumes each byte is 8 bits.
-    sizeof = sizeof * 8
-    bvalue = generate_binary_value(sizeof)
-    hvalue = binary_to_hexa(bvalue)
-    return hvalue
-
-
-# Generate a list of unique hexadecimal values.
-def generate_hexa_list(length, sizeof):
-    hvalues = []
-    for i in range(length):
-        hvalue = generate_hexa_value(sizeof)
-        hvalues.append(hvalue)
-
-    return hvalues
-
-
-# Generate a list of unique hexadecimal values based on datatypes.
-def generate_hexa_list_from_datatypes(dtypes, Target):
-    hvalues = []
-    for dtype in dtypes:
-        sizeof = Target.get_type_details(dtype)["size"]
-        hvalues.append(generate_hexa_value(sizeof))
-
-    return hvalues
+        #   - have the 4 bits after the middle (in this case where
+        #   sizeof >= 8 ) set to 0; (Used when a value is split in two)
+        return (
+            value
+            and (sizeof < 4 or value >> top_shift)
+            and (sizeof < 8 or (value >> middle_shift) & 0xF)
+        )
+
+    # Generate a unique integer of `sizeof` bits. Raises ValueGeneratorError
+    # if every integer of `sizeof` bits is already used.
+    def generate_int(self, sizeof, replace_msb_by_one=False):
+        # Certain cases we need the most significant bit
+        # to be set to one. (e.g, bitfields)
+        msb = 1 << (sizeof - 1) if replace_msb_by_one else 0
+
+        while True:
+            for _ in range(MAX_DRAWS):
+                value = self.random.getrandbits(sizeof) | msb
+                if (
+                    self.is_valid(value, sizeof)
+                    and value not in self.used_values
+                ):
+                    self.used_values.add(value)
+                    return value
+            # The values of larger sizes are never all used.
+            if sizeof <= MAX_ENUMERATED_SIZEOF:
+                break
+
+        # Most of the values are used (e.g after 225 values of 8 bits): pick
+        # one of the remaining ones, if any.
+        remaining = [
+            value
+            for value in range(msb, 1 << sizeof)
+            if value & msb == msb
+            and self.is_valid(value, sizeof)
+            and value not in self.used_values
+        ]
+        if not remaining:
+            raise ValueGeneratorError(
+                f"Every value of {sizeof} bits is already used."
+            )
+        value = self.random.choice(remaining)
+        self.used_values.add(value)
+        return value
+
+    # Generate a unique binary string of `sizeof` bits.
+    def generate_binary_value(self, sizeof, replace_msb_by_one=False):
+        value = self.generate_int(sizeof, replace_msb_by_one)
+        return format(value, f"0{sizeof}b")
+
+    def generate_hexa_value(self, sizeof):
+        # The `sizeof`` represents the size of the value in hexadecimal.
+        # We need to convert this to the equivalent bit size.
+        # FIXME! This assumes each byte is 8 bits.
+        value = self.generate_int(sizeof * 8)
+        return f"0x{value:0{sizeof * 2}x}"
+
+    # Generate a list of unique hexadecimal values.
+    def generate_hexa_list(self, length, sizeof):
+        return [self.generate_hexa_value(sizeof) for _ in range(length)]
+
+    # Generate a list of unique hexadecimal values based on datatypes.
+    def generate_hexa_list_from_datatypes(self, dtypes, Target):
+        return [
+            self.generate_hexa_value(Target.get_type_details(dtype)["size"])
+            for dtype in dtypes
+        ]
 
 
 # Convert binary to hexa
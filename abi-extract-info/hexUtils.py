@@ -8,9 +8,14 @@
 """
 This class is responsible for a set of utility
 functions for handling hexadecimal values.
+
+The values are given and returned as hexadecimal strings, whose length
+gives the size of the value (e.g "0x00ff" is 2 bytes), but are compared as
+integers: extending, splitting and combining them are masks and shifts.
+The values are looked up in the index of their dump, see `valueIndex.py`.
 """
 
-import helper
+import valueIndex
 
 
 class HexUtils:
@@ -50,16 +55,6 @@ class HexUtils:
         num_bytes = (hex_length + 1) // 2
         return num_bytes
 
-    # Combine hexadecimal values i.e 0x1234 + 0x5678 = 0x56781234
-    def _combine_hex_values(self, hex_values, endianness="little_endian"):
-        if endianness == "little_endian":
-            concatenated = "".join(h[2:] for h in reversed(hex_values))
-        elif endianness == "big_endian":
-            concatenated = "".join(h[2:] for h in hex_values)
-
-        combined_hex = "0x" + concatenated
-        return combined_hex
-
     # Split a hexadecimal value into two halves.
     def _split_hex_value(self, value):
         value = self._remove_identifier(value)  # Remove '0x' prefix
@@ -68,6 +63,14 @@ class HexUtils:
         second_half = f"0x{value[midpoint:]}"
         return first_half, second_half
 
+    # Split a hexadecimal value into the integers of its two halves, as
+    # `_split_hex_value`.
+    def _split_int_value(self, value):
+        digits = len(self._remove_identifier(value))
+        shift = 4 * (digits - digits // 2)
+        ivalue = int(value, 16)
+        return ivalue >> shift, ivalue & ((1 << shift) - 1)
+
     # Extend a value as zero or sign extended.
     def _zero_or_sign_extend(self, value, sizeof_int, is_zero):
         value = self._remove_identifier(value)
@@ -79,52 +82,94 @@ class HexUtils:
         value = self._add_identifier(value)
         return value
 
-    def _zero_extend(self, value, sizeof):
-        is_zero = True
-        hvalue = self._zero_or_sign_extend(value, sizeof, is_zero)
-        return hvalue
+    # Register names of the `locations` found by a `valueIndex.ValueIndex`.
+    def _register_names(self, locations):
+        return [
+            self.Target.get_registers(bank_name)[index]
+            for _, bank_name, index in locations
+        ]
+
+    # The stack entries referenced by the first argument register (FIXME Cant
+    # be hardcoded.) before the position `end`, as the value of the entry
+    # and the value of the register.
+    # We only taking into account the first register, because it has been observed that the
+    # compiler might use another of the argument registers to store a stack address to load
+    # the values into the first argument register before the actual function call.
+    # i.e it first stores the values into the stack, then loads it to register.
+    def _referenced_stack_entries(self, register_banks, stack, end=None):
+        index = valueIndex.index_of(register_banks, stack)
+        argument_registers = self.Target.get_argument_registers()
+        register_value = index.register_values(self.Target)[
+            argument_registers[0]
+        ]
+        positions = index.stack_positions(valueIndex.to_int(register_value))
+        if end is None:
+            end = len(stack)
+        return [
+            (stack[position][1], register_value)
+            for position in positions
+            if position < end
+        ]
+
+    # Pop the values of `argv` fitting together in a register, and combine
+    # them i.e 0x1234 + 0x5678 = 0x56781234 (little endian). Returns the
+    # combined hexadecimal value.
+    def _combine_values(self, argv, register_size):
+        ivalue = 0
+        digits = 0
+        res = []
+
+        # Aggregate values until the combined size reaches or exceeds register_size
+        while argv and (digits + 1) // 2 < register_size:
+            res.append(argv.pop(0))
+            digits += len(self._remove_identifier(res[-1]))
+
+            # Check if combining with the next value fits within `register_size`
+            if argv:
+                next_value = argv[0]
+                if (digits + 1) // 2 + self.sizeof(next_value) <= register_size:
+                    res.append(argv.pop(0))
+                    digits += len(self._remove_identifier(res[-1]))
+                else:
+                    break
 
-    def _sign_extend(self, value, sizeof):
-        is_zero = False
-        hvalue = self._zero_or_sign_extend(value, sizeof, is_zero)
-        return hvalue
+        # Special case for combining values - `char`, `short`
+        # When we are passing a `struct {char, short}`, the char value will be extended
+        # to align with short.
+        pad = [0] * len(res)
+        if (
+            len(res) == 2
+            and self.sizeof(res[0]) == 1
+            and self.sizeof(res[1]) == 2
+        ):
+            # Adjust representation for short exception.
+            pad[0] = 2
+            digits += 2
+
+        shift = 0
+        for value, value_pad in zip(res, pad):
+            ivalue |= int(value, 16) << shift
+            shift += 4 * (len(self._remove_identifier(value)) + value_pad)
+
+        return f"0x{ivalue:0{digits}x}" if digits else "0x"
 
     # Finds the complete argument values in the register banks.
     def find_registers_fill(self, argv, register_banks):
         registers = {}
         inconsistencies = []
+        index = valueIndex.index_of(register_banks)
 
         # Iterate through each value in argv.
         while argv:
-            tmp = []
             value = argv.pop(0)
 
-            # Search for the value in each register bank.
-            for bank_name, bank_register in register_banks.items():
-                bank_register_names = self.Target.get_registers(bank_name)
-                for index, register_value in enumerate(bank_register):
-
-                    # Convert hexadecimal values to binary.
-                    bvalue_register = helper.hexa_to_binary(register_value)
-                    bvalue = helper.hexa_to_binary(value)
-                    # Convert expected value to zero extended.
-                    zero_register_value = self._zero_extend(
-                        value, self.sizeof(register_value)
-                    )
-                    # Convert expected value to sign extended.
-                    sign_register_value = self._sign_extend(
-                        value, self.sizeof(register_value)
-                    )
-
-                    if (
-                        bvalue_register == bvalue
-                        or bvalue_register
-                        == helper.hexa_to_binary(zero_register_value)
-                        or bvalue_register
-                        == helper.hexa_to_binary(sign_register_value)
-                    ):
-                        tmp.append(bank_register_names[index])
-                        registers[bank_register_names[index]] = value
+            # Search for the value (or its zero or sign extension) in each
+            # register bank.
+            tmp = self._register_names(
+                index.find_registers(int(value, 16), self.sizeof(value))
+            )
+            for register in tmp:
+                registers[register] = value
 
             if len(tmp) > 1:
                 inconsistencies.append(tmp)
@@ -135,31 +180,16 @@ class HexUtils:
     def find_value_fill_in_stack(self, citeration, argv, stack):
         addresses = []
         inconsistencies = []
+        index = valueIndex.index_of(stack=stack)
 
         value = argv[-1]
-        for stack_address, stack_value in stack:
-            # Convert hexadecimal values to binary.
-            bvalue_stack = helper.hexa_to_binary(stack_value)
-            bvalue = helper.hexa_to_binary(value)
-
-            # Convert expected value to zero extended.
-            zero_stack_value = self._zero_extend(
-                value, self.sizeof(stack_value)
-            )
-            # Convert expected value to sign extended.
-            sign_stack_value = self._sign_extend(
-                value, self.sizeof(stack_value)
-            )
-
-            if (
-                bvalue_stack == bvalue
-                or bvalue_stack == helper.hexa_to_binary(zero_stack_value)
-                or bvalue_stack == helper.hexa_to_binary(sign_stack_value)
-            ):
-                for k, v in citeration["registers"].items():
-                    if v == value:
-                        inconsistencies.append((k, "[stack]"))
-                addresses.append(stack_address)
+        # Search for the value (or its zero or sign extension).
+        positions = index.find_stack(int(value, 16), self.sizeof(value))
+        for position in positions:
+            for k, v in citeration["registers"].items():
+                if v == value:
+                    inconsistencies.append((k, "[stack]"))
+            addresses.append(stack[position][0])
 
         return (addresses, inconsistencies)
 
@@ -173,14 +203,17 @@ class HexUtils:
         if self.sizeof(value) < self.Target.get_type_details("int")["size"]:
             return addresses, inconsistencies
 
-        high, low = self._split_hex_value(value)
+        index = valueIndex.index_of(stack=stack)
+        high, low = self._split_int_value(value)
 
-        for stack_address, stack_value in stack:
-            if stack_value in (high, low):
-                for k, v in citeration["registers"].items():
-                    if v == stack_value:
-                        inconsistencies.append((k, "[stack]"))
-                addresses.append(stack_address)
+        for position in sorted(
+            set(index.find_stack(high) + index.find_stack(low))
+        ):
+            stack_address, stack_value = stack[position]
+            for k, v in citeration["registers"].items():
+                if v == stack_value:
+                    inconsistencies.append((k, "[stack]"))
+            addresses.append(stack_address)
 
         return (addresses, inconsistencies)
 
@@ -216,6 +249,7 @@ class HexUtils:
         registers = {}
         inconsistencies = []
         order = ""
+        index = valueIndex.index_of(register_banks)
 
         register_size = self.Target.get_register_size()
 
@@ -228,38 +262,42 @@ class HexUtils:
             # Split the value if its size exceeds the register size
             if sizeof_value > register_size:
                 first_half, second_half = self._split_hex_value(value)
+                ifirst_half, isecond_half = self._split_int_value(value)
 
                 # Search for each half in each register bank.
-                for bank_name, bank_register in register_banks.items():
-                    bank_register_names = self.Target.get_registers(bank_name)
-                    for index, register_value in enumerate(bank_register):
-
-                        # Get the order of [low] and [high]
-                        if not order:
-                            if (
-                                register_value == first_half
-                                and bank_register[index + 1] == second_half
-                            ):
-                                order = "[high], [low]"
-                            elif (
-                                register_value == second_half
-                                and bank_register[index + 1] == first_half
-                            ):
-                                order = "[low], [high]"
-
-                        # Convert hexadecimal values to binary.
-                        bvalue_register = helper.hexa_to_binary(register_value)
-                        bvalue_first_half = helper.hexa_to_binary(first_half)
-                        bvalue_second_half = helper.hexa_to_binary(second_half)
-
-                        if bvalue_register == bvalue_first_half:
-                            # Append register
-                            tmp.append(bank_register_names[index])
-                            registers[bank_register_names[index]] = first_half
-                        elif bvalue_register == bvalue_second_half:
-                            # Append register
-                            tmp.append(bank_register_names[index])
-                            registers[bank_register_names[index]] = second_half
+                locations = sorted(
+                    set(
+                        index.find_registers(ifirst_half)
+                        + index.find_registers(isecond_half)
+                    )
+                )
+                for _, bank_name, register_index in locations:
+                    bank_register = index.int_register_banks[bank_name]
+                    register_value = bank_register[register_index]
+                    register = self.Target.get_registers(bank_name)[
+                        register_index
+                    ]
+
+                    # Get the order of [low] and [high]
+                    if not order and register_index + 1 < len(bank_register):
+                        next_value = bank_register[register_index + 1]
+                        if (
+                            register_value == ifirst_half
+                            and next_value == isecond_half
+                        ):
+                            order = "[high], [low]"
+                        elif (
+                            register_value == isecond_half
+                            and next_value == ifirst_half
+                        ):
+                            order = "[low], [high]"
+
+                    # Append register
+                    tmp.append(register)
+                    if register_value == ifirst_half:
+                        registers[register] = first_half
+                    else:
+                        registers[register] = second_half
 
                 if len(tmp) > 1:
                     inconsistencies.append(tmp)
@@ -273,60 +311,18 @@ class HexUtils:
 
         registers = {}
         inconsistencies = []
+        index = valueIndex.index_of(register_banks)
 
         # Process `argv` to combine values.
         while argv:
-            # Peek the value from `argv`
-            value = argv[0]
-            res = []
-            tmp = []
-
-            # Aggregate values until the combined size reaches or exceeds register_size
-            while (
-                argv
-                and self.sizeof(self._combine_hex_values(res)) < register_size
-            ):
-                res.append(argv.pop(0))
-
-                if argv:
-                    next_value = argv[0]
-                    # Check if combining with the next value fits within `register_size`
-                    if (
-                        self.sizeof(self._combine_hex_values(res))
-                        + self.sizeof(next_value)
-                        <= register_size
-                    ):
-                        res.append(argv.pop(0))
-                    else:
-                        break
-
-            # Special case for combining values - `char`, `short`
-            # When we are passing a `struct {char, short}`, the char value will be extended
-            # to align with short.
-            if (
-                len(res) == 2
-                and self.sizeof(res[0]) == 1
-                and self.sizeof(res[1]) == 2
-            ):
-                res[0] = (
-                    f"0x00{res[0][2:]}"  # Adjust representation for short exception.
-                )
-
-            # Combine the aggregated values into a single hexadecimal value.
-            combined_hex = self._combine_hex_values(res)
+            # Combine the values fitting in a register.
+            combined_hex = self._combine_values(argv, register_size)
+            icombined = int(combined_hex, 16)
 
             # Search for the combined hexadecimal value in each register bank.
-            for bank_name, bank_register in register_banks.items():
-                bank_register_names = self.Target.get_registers(bank_name)
-                for index, register_value in enumerate(bank_register):
-                    # Convert hexadecimal values to binary.
-                    bvalue_register = helper.hexa_to_binary(register_value)
-                    bvalue_combined = helper.hexa_to_binary(combined_hex)
-
-                    if bvalue_register == bvalue_combined:
-                        # Append register
-                        tmp.append(bank_register_names[index])
-                        registers[bank_register_names[index]] = combined_hex
+            tmp = self._register_names(index.find_registers(icombined))
+            for register in tmp:
+                registers[register] = combined_hex
             if len(tmp) > 1:
                 inconsistencies.append(tmp)
 
@@ -337,35 +333,16 @@ class HexUtils:
         passed_by_ref = None
         passed_by_ref_register = None
 
-        argument_registers = self.Target.get_argument_registers()
-
-        # Build a dictionary of register-values from the register banks.
-        register_values_dict = dict()
-        for bank_name, register_values in register_banks.items():
-            registers = self.Target.get_registers(bank_name)
-            for index, reg in enumerate(registers):
-                register_values_dict[reg] = register_values[index]
-
-        # Iterate over stack to find matching pairs.
-        for index, stack_tuple in enumerate(stack):
-            # Get the index's stack address and correspoding value.
-            stack_address, stack_value = stack_tuple
-
-            # If the current stack address is in the first argument register. (FIXME Cant be hardcoded.)
-            # We only taking into account the first register, because it has been observed that the
-            # compiler might use another of the argument registers to store a stack address to load
-            # the values into the first argument register before the actual function call.
-            # i.e it first stores the values into the stack, then loads it to register.
-            if register_values_dict[argument_registers[0]] == stack_address:
-                # FIXME Here it would make sense to validate the next stack value,
-                # but has been observe that the next value is not always in the next stack address.
-                if stack_value == argv[0]:
-                    passed_by_ref_register = register_values_dict[
-                        argument_registers[0]
-                    ]
-                    passed_by_ref = "[stack]"
+        for stack_value, register_value in self._referenced_stack_entries(
+            register_banks, stack
+        ):
+            # FIXME Here it would make sense to validate the next stack value,
+            # but has been observe that the next value is not always in the next stack address.
+            if stack_value == argv[0]:
+                passed_by_ref_register = register_value
+                passed_by_ref = "[stack]"
 
-                    return (passed_by_ref, passed_by_ref_register)
+                return (passed_by_ref, passed_by_ref_register)
 
         return (passed_by_ref, passed_by_ref_register)
 
@@ -378,14 +355,10 @@ class HexUtils:
 
         # The reg_bank0 registers are used for the passed by reference,
         # even with floating-point register values.
-        argument_registers = self.Target.get_argument_registers()
-
-        # Build a dictionary of register-values from the register banks.
-        register_values_dict = dict()
-        for bank_name, register_values in register_banks.items():
-            registers = self.Target.get_registers(bank_name)
-            for index, reg in enumerate(registers):
-                register_values_dict[reg] = register_values[index]
+        # The last stack entry is not considered.
+        entries = self._referenced_stack_entries(
+            register_banks, stack, len(stack) - 1
+        )
 
         while argv:
             value = argv.pop(0)
@@ -399,28 +372,14 @@ class HexUtils:
             # Split the value into two parts.
             first_half, second_half = self._split_hex_value(value)
 
-            # Iterate over stack to find matching pairs.
-            for index in range(
-                len(stack) - 1
-            ):  # Use len(stack) -1 to prevent out-of-range error
-                # Get the index's stack address and correspoding value.
-                stack_address, stack_value = stack[index]
-
-                # If the current stack address is in the first argument register. (FIXME Cant be hardcoded.)
-                # We only taking into account the first register, because it has been observed that the
-                # compiler might use another of the argument registers to store a stack address to load
-                # the values into the first argument register before the actual function call.
-                # i.e it first stores the values into the stack, then loads it to register.
-                if register_values_dict[argument_registers[0]] == stack_address:
-                    # FIXME Here it would make sense to validate the next stack value,
-                    # but has been observe that the next value is not always in the next stack address.
-                    if stack_value == first_half or stack_value == second_half:
-                        passed_by_ref_register = register_values_dict[
-                            argument_registers[0]
-                        ]
-                        passed_by_ref = "[stack]"
-
-                        return (passed_by_ref, passed_by_ref_register)
+            for stack_value, register_value in entries:
+                # FIXME Here it would make sense to validate the next stack value,
+                # but has been observe that the next value is not always in the next stack address.
+                if stack_value == first_half or stack_value == second_half:
+                    passed_by_ref_register = register_value
+                    passed_by_ref = "[stack]"
+
+                    return (passed_by_ref, passed_by_ref_register)
 
         return (passed_by_ref, passed_by_ref_register)
 
@@ -430,69 +389,20 @@ class HexUtils:
 
         register_size = self.Target.get_register_size()
 
-        argument_registers = self.Target.get_argument_registers()
-
-        # Build a dictionary of register-values from the register banks.
-        register_values_dict = dict()
-        for bank_name, register_values in register_banks.items():
-            registers = self.Target.get_registers(bank_name)
-            for index, reg in enumerate(registers):
-                register_values_dict[reg] = register_values[index]
+        # Here instead of checking all positions in the stack,
+        # we only care about the first one.
+        entries = self._referenced_stack_entries(register_banks, stack)
 
         # Process argv to combine values.
         while argv:
-            # Peek the value from argv
-            value = argv[0]
-            res = []
-            # Aggregate values until the combined size reaches or exceeds register_size.
-            while (
-                argv
-                and self.sizeof(self._combine_hex_values(res)) < register_size
-            ):
-                res.append(argv.pop(0))
-
-                # Check if adding the next would still fit within `register_size`.
-                if argv:
-                    next_value = argv[0]
-                    if (
-                        self.sizeof(self._combine_hex_values(res))
-                        + self.sizeof(next_value)
-                        <= register_size
-                    ):
-                        res.append(argv.pop(0))
-                    else:
-                        break
-
-            # Special case for combining values - `char`, `short`
-            # When we are passing a `struct {char, short}`, the char value will be extended
-            # to align with short.
-            if (
-                len(res) == 2
-                and self.sizeof(res[0]) == 1
-                and self.sizeof(res[1]) == 2
-            ):
-                res[0] = (
-                    f"0x00{res[0][2:]}"  # Adjust representation for short exception.
-                )
-
-            # Combine the aggregated values into a single hexadecimal value.
-            combined_hex = self._combine_hex_values(res)
+            # Combine the values fitting in a register.
+            combined_hex = self._combine_values(argv, register_size)
 
-            # Iterate over the stack to find a matching reference.
-            for index in range(len(stack)):
-                if index > len(stack) - 1:
-                    break
+            for stack_value, register_value in entries:
+                if stack_value == combined_hex:
+                    passed_by_ref_register = register_value
+                    passed_by_ref = "[stack]"
 
-                # Here instead of checking all positions in the stack,
-                # we only care about the first one.
-                stack_address, stack_value = stack[index]
-                if register_values_dict[argument_registers[0]] == stack_address:
-                    if stack_value == combined_hex:
-                        passed_by_ref_register = register_values_dict[
-                            argument_registers[0]
-                        ]
-                        passed_by_ref = "[stack]"
-
-                        return (passed_by_ref, passed_by_ref_register)
+                    return (passed_by_ref, passed_by_ref_register)
 
         return (passed_by_ref, passed_by_ref_register)
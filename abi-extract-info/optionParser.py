@@ -33,6 +33,23 @@ class OptionParser:
             exit(1)
         self.flags[tool] = value
 
+    def set_value(self, name, value, convert=str):
+        if value is None:
+            print(f"fatal: Missing value for option {name}.")
+            exit(1)
+        try:
+            self.flags[name] = convert(value)
+        except ValueError:
+            print(f"fatal: Invalid value for option {name}: {value}")
+            exit(1)
+
+    # Conversion for options expecting a count, e.g `-j <N>`.
+    @staticmethod
+    def positive_int(value):
+        if int(value) < 1:
+            raise ValueError
+        return int(value)
+
     def get(self, name):
         return self.flags.get(name, False)
 
@@ -54,7 +71,20 @@ Options:
   -sim <simulator wrapper>      Select the simulator.
   -v | --verbose                Print execution commands.
   --print-report                Print summary report upon conclusion.
-  --save-temps                  Do not delete the temporary files from "tmp/" directory.
+  --save-temps                  Do not delete the temporary files from "tmp/run-*" directory.
+  --cache-dir <directory>       Cache compiler and assembler outputs in <directory>.
+  --cache-size <MiB>            Maximum size of the cache (default: 512).
+  --rerun                       Run every analyzer again instead of reusing its cached result.
+  --single-invocation           Build each test with a single compiler invocation.
+  --pipe                        Keep generated sources and intermediate files in memory.
+  --batch                       Build independent test cases as a single program.
+  --binary-dump                 Dump registers and stack as binary records instead of text.
+  --speculate <K>               Probe up to <K> sizes at once when searching a boundary (default: 1).
+  --seed <N>                    Generate the test values from seed <N>, for reproducible runs.
+  --record <archive>            Record the sources and outputs of every test in <archive>.
+  --replay <archive>            Replay the outputs recorded in <archive>, without any toolchain.
+  --trace <file>                Write a Chrome trace of the analyzers, tests and processes to <file>.
+  -j | --jobs <N>               Run up to <N> toolchain or simulator processes at once (default: 1).
   --help                        Display this information.
   --help=cc                     Display available compiler options.
   --help=sim                    Display available simulator options.
@@ -66,6 +96,10 @@ Options:
         self.set("cc", "gcc-rv32gc-ilp32d")
         self.set("sim", "qemu-riscv32")
         self.set("verbose", False)
+        self.set("cache_size", 512)
+        self.set("jobs", 1)
+        self.set("speculate", 1)
+        self.set("seed", None)
 
     def option_parser(self, args=sys.argv[1:]):
         self.set_default()
@@ -82,6 +116,20 @@ Options:
             "--verbose":      lambda: self.set("verbose"),
             "--print-report": lambda: self.set("print-report"),
             "--save-temps":   lambda: self.set("save_temps"),
+            "--cache-dir":    lambda: self.set_value("cache_dir", next(arg_iter, None)),
+            "--cache-size":   lambda: self.set_value("cache_size", next(arg_iter, None), self.positive_int),
+            "--rerun":        lambda: self.set("rerun"),
+            "--single-invocation": lambda: self.set("single_invocation"),
+            "--pipe":         lambda: self.set("pipe"),
+            "--batch":        lambda: self.set("batch"),
+            "--binary-dump":  lambda: self.set("binary_dump"),
+            "--speculate":    lambda: self.set_value("speculate", next(arg_iter, None), self.positive_int),
+            "--seed":         lambda: self.set_value("seed", next(arg_iter, None), int),
+            "--record":       lambda: self.set_value("record", next(arg_iter, None)),
+            "--replay":       lambda: self.set_value("replay", next(arg_iter, None)),
+            "--trace":        lambda: self.set_value("trace", next(arg_iter, None)),
+            "-j":             lambda: self.set_value("jobs", next(arg_iter, None), self.positive_int),
+            "--jobs":         lambda: self.set_value("jobs", next(arg_iter, None), self.positive_int),
         }
 
         help_options = {
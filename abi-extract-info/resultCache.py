@@ -0,0 +1,106 @@
+#! /bin/env python
+# Copyright 2025-present, Synopsys, Inc.
+# All rights reserved.
+#
+# This source code is licensed under the GPL-3.0 license found in
+# the LICENSE file in the root directory of this source tree.
+
+"""
+Most runs use an unchanged toolchain, and get the same result from every
+analyzer. This cache stores the summary of each analyzer, along with the
+`TargetArch` facts it provides (see `Analyzer.provides`), so that later runs
+restore them instead of running the analyzer again.
+
+The entries are stored in an `artifactCache.ArtifactCache`, the key being a
+hash of:
+- the toolchain fingerprint: the contents of the wrappers and the version
+  they report (see `CompilationDriver.fingerprint`), and the flags;
+- the code version: the sources of the tool and of the test programs;
+- the analyzer name and the `TargetArch` facts it requires;
+- the seed of the test values (see `--seed`).
+"""
+
+import json
+import os
+import pathlib
+
+
+class ResultCache:
+    def __init__(self, cache, rerun=False):
+        # `artifactCache.ArtifactCache` storing the results.
+        self.cache = cache
+        # Run every analyzer again, only storing their results.
+        self.rerun = rerun
+        self.version = self.code_version()
+
+    # Hash of the sources of the tool and of the test programs.
+    def code_version(self):
+        root = pathlib.Path(__file__).resolve().parent.parent
+        paths = sorted(root.glob("abi-extract-info/**/*.py"))
+        paths += sorted(
+            path for path in root.glob("src/**/*") if path.is_file()
+        )
+        parts = []
+        for path in paths:
+            parts += [str(path.relative_to(root)), path.read_bytes()]
+        return self.cache.key(*parts)
+
+    # The values of the `TargetArch` facts `facts`.
+    def facts(self, Target, facts):
+        return {fact: getattr(Target, fact) for fact in facts}
+
+    def key(self, analyzer):
+        Driver = analyzer.Driver
+        toolchain = [
+            Driver.fingerprint(tool)
+            for tool in (
+                Driver.cc,
+                Driver.assembler,
+                Driver.linker,
+                Driver.simulator,
+            )
+        ]
+        return self.cache.key(
+            *toolchain,
+            " ".join(Driver.cflags),
+            self.version,
+            type(analyzer.Target).__name__,
+            analyzer.name,
+            json.dumps(
+                self.facts(analyzer.Target, analyzer.requires), sort_keys=True
+            ),
+            repr(Driver.seed),
+        )
+
+    def _path(self, analyzer):
+        return os.path.join(analyzer.Driver.workspace, f"{analyzer.name}.json")
+
+    # Returns the summary of `analyzer` cached for `key` and restores the
+    # facts it provides, or None on a miss.
+    def lookup(self, analyzer, key):
+        if self.rerun:
+            return None
+
+        path = self._path(analyzer)
+        if not self.cache.lookup(key, path):
+            return None
+        with open(path, "r", encoding="utf-8") as file:
+            result = json.load(file)
+
+        for fact, value in result["facts"].items():
+            setattr(analyzer.Target, fact, value)
+        return result["summary"]
+
+    # Store the summary of `analyzer` for `key`, and the facts it provides.
+    def store(self, analyzer, key, summary):
+        result = {
+            "summary": summary,
+            "facts": self.facts(analyzer.Target, analyzer.provides),
+        }
+        path = self._path(analyzer)
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(result, file)
+        self.cache.store(key, path)
+
+    def stats(self):
+        return self.cache.stats()
@@ -0,0 +1,113 @@
+#! /bin/env python
+# Copyright 2025-present, Synopsys, Inc.
+# All rights reserved.
+#
+# This source code is licensed under the GPL-3.0 license found in
+# the LICENSE file in the root directory of this source tree.
+
+"""
+Working on the analyzers (e.g `HexUtils`, `ArgPassTests`) does not require
+running the toolchain and the simulator again and again: the same tests get
+the same stdout.
+
+With `--record <archive>`, every test program run by the driver is stored in
+a compressed zip archive: its generated sources, the hash of its executable
+and the stdout of its simulation. The seed of the run is stored as well, so
+that the tests are generated the same way when replaying it.
+
+With `--replay <archive>`, `CompilationDriver.run` returns the stdout stored
+for each test instead of building and simulating it, without any toolchain.
+A test is looked up by its name, its sources (generated or not) and the
+compilation flags, see `RunArchive.key`.
+
+The archive contains:
+```
+metadata.json     - {"seed": <seed of the run>}
+runs/<key>.json   - {"name": ..., "sources": [...], "elf": ..., "stdout": ...}
+```
+"""
+
+import hashlib
+import json
+import zipfile
+
+
+class RunArchiveError(Exception):
+    """
+    This exception is raised when an archive cannot be read.
+    """
+
+
+class RunArchive:
+    def __init__(self, path, seed=None, replay=False):
+        self.path = path
+        self.seed = seed
+        self.replay = replay
+        # Key -> run, see `record()`.
+        self.runs = {}
+
+    # Load the archive `path` to replay it.
+    @classmethod
+    def load(cls, path):
+        archive = cls(path, replay=True)
+        try:
+            with zipfile.ZipFile(path) as file:
+                archive.seed = json.loads(file.read("metadata.json"))["seed"]
+                for name in file.namelist():
+                    if name.startswith("runs/"):
+                        run = json.loads(file.read(name))
+                        archive.runs[name[len("runs/") : -len(".json")]] = run
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile) as error:
+            raise RunArchiveError(f"Cannot read archive {path}: {error}")
+        return archive
+
+    # Key of a test program, out of its name, the contents of its source
+    # files (`files`), its generated sources and the compilation flags.
+    def key(self, name, files, sources, cflags):
+        digest = hashlib.sha256()
+        parts = [name, " ".join(cflags)]
+        for path in files:
+            with open(path, "rb") as file:
+                parts.append(file.read())
+        parts += [source.encode() for source in sources]
+        for part in parts:
+            if isinstance(part, str):
+                part = part.encode()
+            digest.update(b"%d:" % len(part))
+            digest.update(part)
+        return digest.hexdigest()
+
+    # The stdout recorded for `key`, or None.
+    def lookup(self, key):
+        run = self.runs.get(key)
+        return run["stdout"] if run else None
+
+    # Record the run of a test program, built into the executable `elfFile`.
+    def record(self, key, name, sources, elfFile, stdout):
+        self.runs[key] = {
+            "name": name,
+            "sources": sources,
+            "elf": self.elf_hash(elfFile),
+            "stdout": stdout,
+        }
+
+    # Hash of the executable `path`, or None if there is none (e.g its stdout
+    # came from the artifact cache).
+    def elf_hash(self, path):
+        try:
+            with open(path, "rb") as file:
+                content = file.read()
+        except OSError:
+            return None
+        return hashlib.sha256(content).hexdigest() if content else None
+
+    # Write the recorded runs to the archive.
+    def close(self):
+        if self.replay:
+            return
+        with zipfile.ZipFile(
+            self.path, "w", compression=zipfile.ZIP_LZMA
+        ) as file:
+            file.writestr("metadata.json", json.dumps({"seed": self.seed}))
+            for key, run in sorted(self.runs.items()):
+                file.writestr(f"runs/{key}.json", json.dumps(run))
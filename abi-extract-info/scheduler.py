@@ -0,0 +1,116 @@
+#! /bin/env python
+# Copyright 2025-present, Synopsys, Inc.
+# All rights reserved.
+#
+# This source code is licensed under the GPL-3.0 license found in
+# the LICENSE file in the root directory of this source tree.
+
+"""
+This scheduler runs the analyzers following the `TargetArch` facts they
+provide and require (e.g `ArgPassAnalyzer` requires the "type_details"
+provided by `DataTypesAnalyzer`), so that independent analyzers can run at
+the same time.
+
+When more analyzers are ready than can run, the ones on the longest chain
+of dependent analyzers (the critical path) are started first. The summaries
+are still returned in the order of the given analyzers, so that the report
+does not depend on the order of completion.
+"""
+
+import concurrent.futures
+
+
+class SchedulerError(Exception):
+    """
+    This exception is raised when the dependencies of the analyzers cannot
+    be satisfied.
+    """
+
+
+class Scheduler:
+    def __init__(self, analyzers, jobs=1):
+        self.analyzers = analyzers
+        # Maximum number of analyzers running at the same time.
+        self.jobs = jobs
+
+        providers = {}
+        for analyzer in analyzers:
+            for fact in analyzer.provides:
+                providers[fact] = analyzer
+
+        # The analyzers each analyzer depends on, and the reverse.
+        self.dependencies = {analyzer: set() for analyzer in analyzers}
+        self.dependents = {analyzer: set() for analyzer in analyzers}
+        for analyzer in analyzers:
+            for fact in analyzer.requires:
+                if fact not in providers:
+                    raise SchedulerError(
+                        f"No analyzer provides '{fact}' required by "
+                        f"'{analyzer.name}'."
+                    )
+                self.dependencies[analyzer].add(providers[fact])
+                self.dependents[providers[fact]].add(analyzer)
+
+        self.priorities = {}
+        for analyzer in analyzers:
+            self.priority(analyzer, [])
+
+    # Length of the longest chain of analyzers depending on `analyzer`,
+    # including itself.
+    def priority(self, analyzer, path):
+        if analyzer in path:
+            names = " -> ".join(a.name for a in path + [analyzer])
+            raise SchedulerError(f"Circular analyzer dependency: {names}.")
+        if analyzer not in self.priorities:
+            self.priorities[analyzer] = 1 + max(
+                [
+                    self.priority(dependent, path + [analyzer])
+                    for dependent in self.dependents[analyzer]
+                ],
+                default=0,
+            )
+        return self.priorities[analyzer]
+
+    # Do not run the analyzers depending (indirectly) on a failed one.
+    def skip(self, analyzer, pending):
+        for dependent in self.dependents[analyzer]:
+            if dependent in pending:
+                pending.remove(dependent)
+                print(
+                    f"Skip: '{dependent.name}' analyzer requires "
+                    f"'{analyzer.name}' analyzer."
+                )
+                self.skip(dependent, pending)
+
+    # Run the analyzers. Returns the summary file of each analyzer (None if
+    # it failed or was skipped), in the order of the given analyzers.
+    def run(self):
+        summaries = {}
+        pending = list(self.analyzers)
+        running = {}
+
+        with concurrent.futures.ThreadPoolExecutor(self.jobs) as executor:
+            while pending or running:
+                ready = [
+                    analyzer
+                    for analyzer in pending
+                    if self.dependencies[analyzer].issubset(summaries)
+                ]
+                # Ties are broken by the order of the given analyzers.
+                ready.sort(key=lambda analyzer: -self.priorities[analyzer])
+                for analyzer in ready[: self.jobs - len(running)]:
+                    pending.remove(analyzer)
+                    running[executor.submit(analyzer.execute)] = analyzer
+
+                done, _ = concurrent.futures.wait(
+                    running, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    analyzer = running.pop(future)
+                    summary_file = future.result()
+                    if summary_file is None:
+                        self.skip(analyzer, pending)
+                    else:
+                        summaries[analyzer] = summary_file
+
+        return [summaries.get(analyzer) for analyzer in self.analyzers]
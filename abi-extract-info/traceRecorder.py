@@ -0,0 +1,122 @@
+#! /bin/env python
+# Copyright 2025-present, Synopsys, Inc.
+# All rights reserved.
+#
+# This source code is licensed under the GPL-3.0 license found in
+# the LICENSE file in the root directory of this source tree.
+
+"""
+With `--trace <file>`, the run is recorded as a Chrome trace (trace event
+JSON), to be opened in a trace viewer (e.g https://ui.perfetto.dev or
+chrome://tracing) to see where the wall time goes.
+
+A span is recorded for:
+- every analyzer run (`Analyzer.execute`), with whether its result came from
+  the result cache and whether it failed;
+- every test program (`Analyzer.generate_async`), with its number of
+  generated sources and the size of its stdout;
+- every toolchain or simulator process (`CompilationDriver.execute`), with
+  its command, its exit code, the size of its stdout and of its output file.
+
+Spans of a kind are shown as a group of rows ("analyzers", "tests" and
+"processes"). Spans running at the same time are put on different rows, so
+that the rows of "processes" show how well the `--jobs` slots are filled.
+"""
+
+import contextlib
+import json
+import os
+import threading
+import time
+
+# Kind of span -> id of its group of rows in the trace, and name of its rows.
+GROUPS = {
+    "analyzers": (1, "analyzer"),
+    "tests": (2, "test"),
+    "processes": (3, "job"),
+}
+
+
+class TraceRecorder:
+    def __init__(self, path):
+        self.path = path
+        self.start = time.perf_counter()
+        # Spans are recorded from the analyzer threads and the event loop of
+        # the driver.
+        self.lock = threading.Lock()
+        self.events = []
+        # Kind of span -> busy state of each of its rows.
+        self.rows = {kind: [] for kind in GROUPS}
+        for kind, (pid, _) in GROUPS.items():
+            self.metadata("process_name", pid, None, kind)
+            self.metadata("process_sort_index", pid, None, pid, "sort_index")
+
+    # Microseconds since the start of the run.
+    def timestamp(self):
+        return (time.perf_counter() - self.start) * 1e6
+
+    def metadata(self, name, pid, tid, value, key="name"):
+        event = {"name": name, "ph": "M", "pid": pid, "args": {key: value}}
+        if tid is not None:
+            event["tid"] = tid
+        self.events.append(event)
+
+    # Take the first free row of `kind`, adding one if they are all busy.
+    def acquire(self, kind):
+        with self.lock:
+            rows = self.rows[kind]
+            if False in rows:
+                row = rows.index(False)
+                rows[row] = True
+            else:
+                row = len(rows)
+                rows.append(True)
+                pid, name = GROUPS[kind]
+                self.metadata("thread_name", pid, row, f"{name} {row}")
+            return row
+
+    # Record the span `name` of `kind` around the body of the `with`
+    # statement. The arguments of the span are given by `args` and can be
+    # completed in the body, e.g with an exit code:
+    # ```
+    # with trace.span("processes", "compile", {"command": ...}) as args:
+    #     args["exit_code"] = ...
+    # ```
+    @contextlib.contextmanager
+    def span(self, kind, name, args=None):
+        args = dict(args or {})
+        row = self.acquire(kind)
+        start = self.timestamp()
+        try:
+            yield args
+        except BaseException as error:
+            args["error"] = type(error).__name__
+            raise
+        finally:
+            end = self.timestamp()
+            with self.lock:
+                self.rows[kind][row] = False
+                self.events.append(
+                    {
+                        "name": name,
+                        "cat": kind,
+                        "ph": "X",
+                        "ts": start,
+                        "dur": end - start,
+                        "pid": GROUPS[kind][0],
+                        "tid": row,
+                        "args": args,
+                    }
+                )
+
+    # Write the trace to `path`.
+    def close(self):
+        with self.lock:
+            events = sorted(self.events, key=lambda event: event.get("ts", 0))
+        trace = {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"pid": os.getpid()},
+        }
+        with open(self.path, "w", encoding="utf-8") as file:
+            json.dump(trace, file)
@@ -0,0 +1,121 @@
+#! /bin/env python
+# Copyright 2025-present, Synopsys, Inc.
+# All rights reserved.
+#
+# This source code is licensed under the GPL-3.0 license found in
+# the LICENSE file in the root directory of this source tree.
+
+"""
+The tests look for every expected value in the register banks and the stack
+of a dump. Instead of scanning them for each value, this index maps each
+integer value of a dump to its locations, and is built once per dump (see
+`DumpInformation`).
+
+A value is also found zero or sign extended: the zero extension of a value is
+the same integer, and its sign extensions are looked up for every larger size
+(up to `MAX_SIZEOF` bytes). Locations are returned in the order of the dump,
+as a scan would find them.
+"""
+
+# Largest register or stack entry, in bytes.
+MAX_SIZEOF = 16
+
+
+# Integer of the hexadecimal string `value`, or None if it is not one (e.g a
+# truncated dump).
+def to_int(value):
+    try:
+        return int(value, 16)
+    except ValueError:
+        return None
+
+
+class ValueIndex:
+    def __init__(self, register_banks, stack):
+        self.register_banks = register_banks
+        self.stack = stack
+
+        # Value -> [(bank position, bank name, register index)].
+        self.registers = {}
+        # Bank name -> integer values of its registers.
+        self.int_register_banks = {}
+        for position, (bank_name, values) in enumerate(register_banks.items()):
+            int_values = [to_int(value) for value in values]
+            self.int_register_banks[bank_name] = int_values
+            for index, value in enumerate(int_values):
+                if value is None:
+                    continue
+                location = (position, bank_name, index)
+                self.registers.setdefault(value, []).append(location)
+
+        # Value -> [stack position], and address -> [stack position].
+        self.stack_values = {}
+        self.stack_addresses = {}
+        for position, entry in enumerate(stack):
+            if len(entry) != 2:
+                continue
+            address, value = to_int(entry[0]), to_int(entry[1])
+            self.stack_values.setdefault(value, []).append(position)
+            self.stack_addresses.setdefault(address, []).append(position)
+
+        # Register name -> value, see `register_values()`.
+        self.named_registers = None
+
+        # Results of `find_registers()` and `find_stack()` already computed
+        # for `(ivalue, sizeof_value)`, see `valueMatch.match_dumps`.
+        self.matches = {}
+        self.stack_matches = {}
+
+    # The integer `ivalue` of `sizeof_value` bytes, and its sign extensions
+    # (filled with ones) to every larger size.
+    def keys(self, ivalue, sizeof_value=None):
+        keys = [ivalue]
+        if sizeof_value is not None:
+            for sizeof in range(sizeof_value + 1, MAX_SIZEOF + 1):
+                mask = (1 << (8 * sizeof)) - (1 << (8 * sizeof_value))
+                keys.append(ivalue | mask)
+        return keys
+
+    # Locations `(bank position, bank name, register index)` of the registers
+    # holding `ivalue`, sign extended as well if `sizeof_value` is given.
+    def find_registers(self, ivalue, sizeof_value=None):
+        if (ivalue, sizeof_value) in self.matches:
+            return self.matches[(ivalue, sizeof_value)]
+        locations = set()
+        for key in self.keys(ivalue, sizeof_value):
+            locations.update(self.registers.get(key, []))
+        return sorted(locations)
+
+    # Positions of the stack entries holding `ivalue`, sign extended as well
+    # if `sizeof_value` is given.
+    def find_stack(self, ivalue, sizeof_value=None):
+        if (ivalue, sizeof_value) in self.stack_matches:
+            return self.stack_matches[(ivalue, sizeof_value)]
+        positions = set()
+        for key in self.keys(ivalue, sizeof_value):
+            positions.update(self.stack_values.get(key, []))
+        return sorted(positions)
+
+    # Positions of the stack entries at the address `iaddress`.
+    def stack_positions(self, iaddress):
+        return self.stack_addresses.get(iaddress, [])
+
+    # Register name -> value (as dumped), for the register names of `Target`.
+    def register_values(self, Target):
+        if self.named_registers is None:
+            self.named_registers = {}
+            for bank_name, values in self.register_banks.items():
+                registers = Target.get_registers(bank_name)
+                for index, reg in enumerate(registers):
+                    self.named_registers[reg] = values[index]
+        return self.named_registers
+
+
+# The index of `register_banks` or `stack`, built with their dump (see
+# `DumpInformation.build_index`), or now if they do not come from a dump.
+def index_of(register_banks=None, stack=None):
+    container = register_banks if register_banks is not None else stack
+    index = getattr(container, "value_index", None)
+    if index is None:
+        index = ValueIndex(register_banks or {}, stack or [])
+    return index
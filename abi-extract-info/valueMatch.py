@@ -0,0 +1,195 @@
+#! /bin/env python
+# Copyright 2025-present, Synopsys, Inc.
+# All rights reserved.
+#
+# This source code is licensed under the GPL-3.0 license found in
+# the LICENSE file in the root directory of this source tree.
+
+"""
+When an analyzer gets many dumps at once (e.g a batch of test cases), the
+expected values of every dump can be matched at once with NumPy, instead of
+being looked up one at a time in the index of each dump (see `valueIndex.py`).
+
+The register banks and the stacks of the dumps are stacked into `uint64`
+arrays (one row per dump, values of up to 16 bytes being split in two words),
+and so are the expected values of each dump:
+complete values (also zero or sign extended), their halves and the values
+combined in a register. Comparing them gives a hit matrix per dump, which is
+stored in the index of the dump, so that the `HexUtils` searches of the tests
+read their results from it:
+
+    valueMatch.match_dumps(Target, dump_informations, argvs)
+    for dump_information, argv in zip(dump_informations, argvs):
+        ArgPassTests(Target).run_test(stack, register_banks, argv)
+
+NumPy is optional. Without it, `match_dumps` does nothing and the tests look
+the values up in the index.
+"""
+
+import hexUtils
+import valueIndex
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def is_supported():
+    return numpy is not None
+
+
+# Largest value matched, in bytes (see `valueIndex.MAX_SIZEOF`).
+MAX_SIZEOF = valueIndex.MAX_SIZEOF
+
+if numpy is not None:
+    # Mask of the `n` least significant bytes of a word, for `n` from 0 to 8.
+    MASKS = numpy.array(
+        [(1 << (8 * n)) - 1 for n in range(9)], dtype=numpy.uint64
+    )
+    # A word is at least `n + 1` bytes if it is above `THRESHOLDS[n - 1]`.
+    THRESHOLDS = numpy.array(
+        [1 << (8 * n) for n in range(1, 8)], dtype=numpy.uint64
+    )
+
+
+# The values searched for `argv` in a dump, as `(integer, size)` tuples. The
+# size is None for values that are only searched as is.
+def queries(Target, argv):
+    hutils = hexUtils.HexUtils(Target)
+    result = {}
+    for value in argv:
+        result[(int(value, 16), hutils.sizeof(value))] = None
+        for half in hutils._split_int_value(value):
+            result[(half, None)] = None
+
+    combined_argv = list(argv)
+    while combined_argv:
+        combined_hex = hutils._combine_values(
+            combined_argv, Target.get_register_size()
+        )
+        result[(int(combined_hex, 16), None)] = None
+    return list(result)
+
+
+# Number of bytes of each value (at least 1), given the `uint64` arrays of
+# its low and high words.
+def sizes_of(low, high):
+    return numpy.where(
+        high > 0,
+        (high[..., None] >= THRESHOLDS).sum(axis=-1) + 9,
+        (low[..., None] >= THRESHOLDS).sum(axis=-1) + 1,
+    )
+
+
+# Masks of the `sizes` least significant bytes of a value, as low and high
+# words.
+def masks_of(sizes):
+    return MASKS[numpy.minimum(sizes, 8)], MASKS[numpy.maximum(sizes - 8, 0)]
+
+
+# Hit matrix of the expected values `expected` (of `sizes` bytes, 0 to only
+# match them as is) in `values`, one row per dump. Values are `(low, high)`
+# tuples of `uint64` arrays (see `stack_values`). Returns a boolean array of
+# shape (dumps, expected values, values).
+def match(values, expected, sizes):
+    found = [words[:, None, :] for words in values]
+    found_sizes = sizes_of(*values)[:, None, :]
+    expected = [words[:, :, None] for words in expected]
+    sizes = numpy.minimum(sizes, MAX_SIZEOF)[:, :, None]
+
+    # The expected value sign extended to the size of the value found.
+    found_masks, masks = masks_of(found_sizes), masks_of(sizes)
+    equal = numpy.ones(numpy.broadcast(found[0], expected[0]).shape, bool)
+    extended = equal.copy()
+    for word in range(2):
+        equal &= found[word] == expected[word]
+        extension = found_masks[word] & ~masks[word]
+        extended &= found[word] == (expected[word] | extension)
+    return equal | ((sizes > 0) & (found_sizes > sizes) & extended)
+
+
+# Stack the values of each dump (lists of the same length) into `(low, high)`
+# `uint64` arrays. Values that are not integers (see `valueIndex.to_int`), or
+# larger than `MAX_SIZEOF` bytes, match none.
+def stack_values(rows):
+    low = numpy.zeros((len(rows), len(rows[0])), dtype=numpy.uint64)
+    high = numpy.zeros(low.shape, dtype=numpy.uint64)
+    valid = numpy.zeros(low.shape, dtype=bool)
+    for row, values in enumerate(rows):
+        for column, value in enumerate(values):
+            if value is not None and value < (1 << (8 * MAX_SIZEOF)):
+                low[row, column] = value & ((1 << 64) - 1)
+                high[row, column] = value >> 64
+                valid[row, column] = True
+    return (low, high), valid
+
+
+# Match the values expected for each dump (`argvs`, one list of hexadecimal
+# values per dump) and store the results in the index of each dump.
+def match_dumps(Target, dump_informations, argvs):
+    if not is_supported() or not dump_informations:
+        return
+
+    indexes = [
+        valueIndex.index_of(d.get_reg_banks(), d.get_stack())
+        for d in dump_informations
+    ]
+
+    # The registers of every bank, in the order of the dump.
+    locations = [
+        (position, bank_name, index)
+        for position, (bank_name, values) in enumerate(
+            indexes[0].int_register_banks.items()
+        )
+        for index in range(len(values))
+    ]
+    register_rows = [
+        [
+            value
+            for values in index.int_register_banks.values()
+            for value in values
+        ]
+        for index in indexes
+    ]
+    stack_rows = [
+        [valueIndex.to_int(entry[1]) for entry in index.stack]
+        for index in indexes
+    ]
+    # Dumps of different targets cannot be stacked.
+    if len({len(row) for row in register_rows}) != 1:
+        return
+    if len({len(row) for row in stack_rows}) != 1 or not stack_rows[0]:
+        return
+
+    rows = [queries(Target, argv) for argv in argvs]
+    width = max(len(row) for row in rows)
+    expected_rows = [
+        [ivalue for ivalue, _ in row] + [None] * (width - len(row))
+        for row in rows
+    ]
+    expected, expected_valid = stack_values(expected_rows)
+    sizes = numpy.array(
+        [
+            [sizeof or 0 for _, sizeof in row] + [0] * (width - len(row))
+            for row in rows
+        ]
+    )
+
+    registers, registers_valid = stack_values(register_rows)
+    register_hits = match(registers, expected, sizes)
+    register_hits &= registers_valid[:, None, :] & expected_valid[:, :, None]
+
+    stack, stack_valid = stack_values(stack_rows)
+    stack_hits = match(stack, expected, sizes)
+    stack_hits &= stack_valid[:, None, :] & expected_valid[:, :, None]
+
+    for case, (index, row) in enumerate(zip(indexes, rows)):
+        for column, (ivalue, sizeof) in enumerate(row):
+            index.matches[(ivalue, sizeof)] = [
+                locations[r]
+                for r in numpy.flatnonzero(register_hits[case, column])
+            ]
+            index.stack_matches[(ivalue, sizeof)] = [
+                int(p) for p in numpy.flatnonzero(stack_hits[case, column])
+            ]
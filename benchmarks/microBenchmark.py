@@ -0,0 +1,283 @@
+#! /bin/env python
+# Copyright 2025-present, Synopsys, Inc.
+# All rights reserved.
+#
+# This source code is licensed under the GPL-3.0 license found in
+# the LICENSE file in the root directory of this source tree.
+
+"""
+Measures the functions run on every dump: `DumpInformation.parse`, the
+`HexUtils` searches and the `helper` conversions, so that their refactors can
+be judged with numbers.
+
+The dumps are built for the configurations of the reference reports (see
+`reports/`, e.g `gcc-rv64gc-lp64d`), by the stub simulator (see `stub.py`):
+one dump per datatype and argument count, as `ArgPassAnalyzer` gets, and one
+per datatype and struct size, as `StructBoundaryAnalyzer` gets. Their values
+are generated from `--seed`, so every run measures the same dumps.
+
+Each function is run over every dump of a configuration, and reports:
+- `ops_per_sec`: dumps processed per second (best of `--repeat` rounds of
+  at least 0.2s);
+- `alloc_bytes`: peak memory allocated to process a dump, on average (see
+  `tracemalloc`);
+- `retained_bytes`: memory still allocated once a dump is processed, on
+  average (e.g the parsed dump).
+```
+$ python3 benchmarks/microBenchmark.py --function DumpInformation.parse
+$ python3 benchmarks/microBenchmark.py --output micro.json
+```
+"""
+
+import argparse
+import gc
+import json
+import pathlib
+import platform
+import re
+import sys
+import timeit
+import tracemalloc
+
+BENCHMARKS = pathlib.Path(__file__).resolve().parent
+ROOT = BENCHMARKS.parent
+sys.path.insert(0, str(ROOT / "abi-extract-info"))
+
+import dumpInformation
+import helper
+import hexUtils
+import stub
+import targetArch
+
+DTYPES = ["char", "short", "int", "long", "long long", "float", "double"]
+# Argument counts and struct sizes (in members) of the dumps.
+MAX_ARGC = 20
+MAX_MEMBERS = 8
+
+
+# The configurations `(name, abi)` of the reference reports.
+def report_configs():
+    configs = {}
+    for path in sorted((ROOT / "reports").glob("*.report")):
+        match = re.match(r"\w+-(rv\d+\w+)-(\w+)_", path.name)
+        if match:
+            configs[f"{match.group(1)}-{match.group(2)}"] = match.group(2)
+    return list(configs.items())
+
+
+# A dump of a configuration, as the stdout of the simulation (text and
+# binary), along with the values of its test.
+class Fixture:
+    def __init__(self, model, dtype, argv, kind):
+        self.dtype = dtype
+        self.argv = argv
+        # "args" for arguments passed as is, "struct" for a struct argument.
+        self.kind = kind
+        self.binaries = [helper.hexa_to_binary(value) for value in argv]
+        self.text = "\n".join(model.dump()) + "\n"
+        model.binary = True
+        self.binary = model.dump_binary().decode("latin-1")
+        model.binary = False
+
+        self.dump_information = dumpInformation.DumpInformation()
+        self.dump_information.parse(self.text)
+        self.register_banks = self.dump_information.get_reg_banks()
+        self.stack = self.dump_information.get_stack()
+
+
+# Build the dumps of the configuration with the ABI `abi`.
+def build_fixtures(abi, seed):
+    model = stub.Model(abi)
+    fixtures = []
+    for dtype in DTYPES:
+        size = model.sizes[dtype]
+        # The values of a test are unique, as generated by the analyzers.
+        values = helper.ValueGenerator(helper.derive_seed(seed, abi, dtype))
+        for argc in range(1, MAX_ARGC + 1):
+            values.reset()
+            argv = values.generate_hexa_list(argc, size)
+            model.reset()
+            model.pass_args([(dtype, int(value, 16)) for value in argv])
+            fixtures.append(Fixture(model, dtype, argv, "args"))
+        for members in range(1, MAX_MEMBERS + 1):
+            values.reset()
+            argv = values.generate_hexa_list(members, size)
+            model.reset()
+            model.pass_struct(
+                [dtype] * members, [int(value, 16) for value in argv]
+            )
+            fixtures.append(Fixture(model, dtype, argv, "struct"))
+    return fixtures
+
+
+# The target of the configuration with the ABI `abi`, as set by the
+# analyzers the searches depend on.
+def build_target(abi, fixture):
+    Target = targetArch.RISCV()
+    model = stub.Model(abi)
+    Target.set_type_details(
+        {dtype: {"size": size} for dtype, size in model.sizes.items()}
+    )
+    for bank_id, info in fixture.dump_information.get_reg_bank_infos().items():
+        Target.set_register_size(bank_id, info["size"])
+    Target.set_argument_registers([f"a{index}" for index in range(8)])
+    return Target
+
+
+def parse(text):
+    dump_information = dumpInformation.DumpInformation()
+    dump_information.parse(text)
+    return dump_information
+
+
+# Function name -> function run on a fixture, given the target.
+# fmt: off
+FUNCTIONS = {
+    "DumpInformation.parse":
+        lambda _, f: parse(f.text),
+    "DumpInformation.parse[binary]":
+        lambda _, f: parse(f.binary),
+    "HexUtils.find_registers_fill":
+        lambda h, f: h.find_registers_fill(list(f.argv), f.register_banks),
+    "HexUtils.find_registers_pairs":
+        lambda h, f: h.find_registers_pairs(list(f.argv), f.register_banks),
+    "HexUtils.find_registers_combined":
+        lambda h, f: h.find_registers_combined(
+            list(f.argv), f.register_banks
+        ),
+    "HexUtils.find_ref_in_stack_fill":
+        lambda h, f: h.find_ref_in_stack_fill(
+            f.dtype, list(f.argv), f.register_banks, f.stack
+        ),
+    "HexUtils.find_ref_in_stack_pairs":
+        lambda h, f: h.find_ref_in_stack_pairs(
+            f.dtype, list(f.argv), f.register_banks, f.stack
+        ),
+    "HexUtils.find_ref_in_stack_combined":
+        lambda h, f: h.find_ref_in_stack_combined(
+            f.dtype, list(f.argv), f.register_banks, f.stack
+        ),
+    "helper.hexa_to_binary":
+        lambda _, f: [helper.hexa_to_binary(value) for value in f.argv],
+    "helper.binary_to_hexa":
+        lambda _, f: [helper.binary_to_hexa(value) for value in f.binaries],
+}
+# fmt: on
+
+
+# Run `function` over every fixture, in `repeat` rounds of at least 0.2s (see
+# `timeit`, which disables the garbage collector). Returns the best number of
+# fixtures processed per second.
+def measure_time(function, hutils, fixtures, repeat):
+    timer = timeit.Timer(
+        lambda: [function(hutils, fixture) for fixture in fixtures]
+    )
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat, number)) / number
+    return len(fixtures) / best if best else 0.0
+
+
+# Run `function` once over every fixture, tracing its allocations. Returns
+# the average peak size allocated, and the average size still allocated once
+# done (e.g its result).
+def measure_allocations(function, hutils, fixtures):
+    peak = retained = 0
+    # The results of the previous fixtures (e.g a dump and its index, which
+    # reference each other) are only freed once done.
+    gc.disable()
+    tracemalloc.start()
+    try:
+        for fixture in fixtures:
+            tracemalloc.reset_peak()
+            size = tracemalloc.get_traced_memory()[0]
+            result = function(hutils, fixture)
+            current, peak_size = tracemalloc.get_traced_memory()
+            peak += peak_size - size
+            retained += current - size
+            del result
+    finally:
+        tracemalloc.stop()
+        gc.enable()
+    return peak / len(fixtures), retained / len(fixtures)
+
+
+def run(configs, functions, repeat, seed):
+    results = []
+    for name, abi in configs:
+        fixtures = build_fixtures(abi, seed)
+        hutils = hexUtils.HexUtils(build_target(abi, fixtures[0]))
+        for function_name in functions:
+            function = FUNCTIONS[function_name]
+            ops_per_sec = measure_time(function, hutils, fixtures, repeat)
+            alloc_bytes, retained_bytes = measure_allocations(
+                function, hutils, fixtures
+            )
+            results.append(
+                {
+                    "config": name,
+                    "function": function_name,
+                    "dumps": len(fixtures),
+                    "ops_per_sec": ops_per_sec,
+                    "alloc_bytes": alloc_bytes,
+                    "retained_bytes": retained_bytes,
+                }
+            )
+            print(
+                f"{name:<14} {function_name:<36} {ops_per_sec:10.0f} ops/s"
+                f" {alloc_bytes:9.0f} B allocated {retained_bytes:9.0f} B kept",
+                file=sys.stderr,
+            )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time the functions run on every dump."
+    )
+    parser.add_argument(
+        "--config",
+        action="append",
+        help="Configuration to run, e.g rv64gc-lp64d (default: all).",
+    )
+    parser.add_argument(
+        "--function",
+        action="append",
+        choices=list(FUNCTIONS),
+        help="Function to run (default: all).",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Rounds over the dumps."
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="Seed of the dump values."
+    )
+    parser.add_argument("--output", help="Write the results to this file.")
+    args = parser.parse_args()
+
+    configs = [
+        (name, abi)
+        for name, abi in report_configs()
+        if not args.config or name in args.config
+    ]
+    if not configs:
+        parser.error(f"unknown configuration: {', '.join(args.config)}")
+
+    output = {
+        "benchmark": "micro",
+        "python": platform.python_version(),
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "results": run(
+            configs, args.function or list(FUNCTIONS), args.repeat, args.seed
+        ),
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(output, file, indent=2)
+    else:
+        json.dump(output, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,295 @@
+#! /bin/env python
+# Copyright 2025-present, Synopsys, Inc.
+# All rights reserved.
+#
+# This source code is licensed under the GPL-3.0 license found in
+# the LICENSE file in the root directory of this source tree.
+
+"""
+Fails when the analyzer core gets slower. The tool runs for every toolchain
+configuration, so a slowdown of the functions run on every dump multiplies
+across them.
+
+The gate runs the micro-benchmarks (see `microBenchmark.py`) and the stub
+benchmark (see `stubBenchmark.py`) with the settings of the baseline file, and
+compares their throughput with the baseline:
+- the dumps per second of `DumpInformation.parse` and of the `HexUtils`
+  searches, for each configuration;
+- the runs per second of the stub benchmark, out of their wall time and of
+  the CPU time of the tool, for each configuration and variant.
+
+A delta table is printed for every function (the `helper` conversions and the
+analyzers of the stub runs are shown, but not gated), and the gate fails when
+the throughput of a gated function drops by more than `--threshold`. The
+regressed functions are measured again first (see `--retries`), so that a
+noisy measure does not fail the gate:
+```
+$ python3 benchmarks/perfGate.py
+$ python3 benchmarks/perfGate.py --suite micro --threshold 0.1
+```
+
+The timings depend on the machine: the baseline file is written on the
+machine running the gate, by `--update`:
+```
+$ python3 benchmarks/perfGate.py --update
+$ python3 benchmarks/perfGate.py --update --stub-config stub-rv32gc-ilp32
+```
+"""
+
+import argparse
+import json
+import pathlib
+import platform
+import sys
+
+import microBenchmark
+import stubBenchmark
+
+BASELINE = pathlib.Path(__file__).resolve().parent / "baseline.json"
+SUITES = ["micro", "stub"]
+
+# Functions whose throughput is gated, by prefix.
+GATED = ("DumpInformation.", "HexUtils.", "stub ")
+
+# Format of the values of the delta table, by unit.
+FORMATS = {"ops/s": ",.0f", "s": ".3f"}
+
+# Settings of the suites written by `--update`, unless given. The stub
+# benchmark spawns many processes, a single configuration is run.
+# fmt: off
+DEFAULTS = {
+    "micro": {"configs": None, "repeat": 3, "seed": 0},
+    "stub":  {"configs": ["stub-rv64gc-lp64d"],
+              "variants": ["default", "batch"], "repeat": 3, "seed": 0},
+}
+# fmt: on
+
+
+# Run the suite `suite` with `settings`, only for the `(function, config)`
+# keys `keys` if given. Returns its results.
+def run_suite(suite, settings, keys=None):
+    configs = settings["configs"]
+    if keys is not None:
+        configs = sorted({config for _, config in keys})
+
+    if suite == "micro":
+        functions = list(microBenchmark.FUNCTIONS)
+        if keys is not None:
+            functions = sorted({function for function, _ in keys})
+        return microBenchmark.run(
+            [
+                (name, abi)
+                for name, abi in microBenchmark.report_configs()
+                if not configs or name in configs
+            ],
+            functions,
+            settings["repeat"],
+            settings["seed"],
+        )
+
+    variants = settings["variants"]
+    if keys is not None:
+        # e.g "stub batch wall".
+        variants = sorted({function.split()[1] for function, _ in keys})
+    return stubBenchmark.run_all(
+        configs, variants, settings["repeat"], 1, settings["seed"]
+    )
+
+
+# Throughput of each function of the results of a suite, as `(function,
+# config) -> (value, unit, throughput)`. The value is the one shown in the
+# table, e.g a time.
+def throughputs(suite, results):
+    values = {}
+    for result in results:
+        config = result["config"]
+        if suite == "micro":
+            ops = result["ops_per_sec"]
+            values[(result["function"], config)] = (ops, "ops/s", ops)
+            continue
+
+        variant = result["variant"]
+        for metric in ("wall", "self_cpu"):
+            seconds = result[metric]
+            values[(f"stub {variant} {metric}", config)] = (
+                seconds,
+                "s",
+                1 / seconds if seconds else 0.0,
+            )
+        for name, seconds in result["analyzers"].items():
+            values[(f"analyzer {variant} {name}", config)] = (
+                seconds,
+                "s",
+                1 / seconds if seconds else 0.0,
+            )
+    return values
+
+
+# Compare the throughputs `current` with `baseline`. Returns the rows of the
+# delta table and the regressed functions (including the gated functions
+# missing from `current`).
+def compare(baseline, current, threshold):
+    regressions = []
+    rows = [("function", "config", "baseline", "current", "delta", "")]
+    for key, (base_value, unit, base_throughput) in baseline.items():
+        function, config = key
+        if key not in current:
+            # A gated function that was renamed or dropped fails the gate.
+            status = ""
+            if function.startswith(GATED):
+                status = "MISSING"
+                regressions.append(key)
+            rows.append((function, config, "", "missing", "", status))
+            continue
+
+        value, _, throughput = current[key]
+        delta = throughput / base_throughput - 1 if base_throughput else 0.0
+        status = ""
+        if function.startswith(GATED):
+            status = "ok"
+            if delta < -threshold:
+                status = "REGRESSED"
+                regressions.append(key)
+        rows.append(
+            (
+                function,
+                config,
+                f"{base_value:{FORMATS[unit]}} {unit}",
+                f"{value:{FORMATS[unit]}} {unit}",
+                f"{delta:+.1%}",
+                status,
+            )
+        )
+    return rows, regressions
+
+
+def print_table(rows):
+    widths = [max(len(row[column]) for row in rows) for column in range(6)]
+    for row in rows:
+        print(
+            "  ".join(
+                cell.rjust(width) if 2 <= column <= 4 else cell.ljust(width)
+                for column, (cell, width) in enumerate(zip(row, widths))
+            ).rstrip()
+        )
+
+
+# Run the suite `suite` and compare it with `baseline`. The regressed
+# functions are measured again up to `retries` times, keeping their best
+# throughput, so that a noisy measure does not fail the gate. Prints the
+# delta table and returns the regressed functions.
+def check_suite(suite, baseline, threshold, retries):
+    settings = baseline["settings"]
+    expected = throughputs(suite, baseline["results"])
+    current = throughputs(suite, run_suite(suite, settings))
+    rows, regressions = compare(expected, current, threshold)
+    for _ in range(retries):
+        # The missing functions cannot be measured again.
+        regressed = [key for key in regressions if key in current]
+        if not regressed:
+            break
+        print(f"Measuring {len(regressed)} regressed function(s) again...")
+        again = throughputs(suite, run_suite(suite, settings, regressed))
+        for key, value in again.items():
+            if key in regressed and value[2] > current[key][2]:
+                current[key] = value
+        rows, regressions = compare(expected, current, threshold)
+
+    print(f"\n{suite}:")
+    print_table(rows)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare the benchmarks with a baseline."
+    )
+    parser.add_argument(
+        "--baseline",
+        default=str(BASELINE),
+        help="Baseline file (default: benchmarks/baseline.json).",
+    )
+    parser.add_argument(
+        "--suite",
+        action="append",
+        choices=SUITES,
+        help="Suite to run (default: all).",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="Throughput drop failing the gate (default: 0.2, i.e 20%%).",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=1,
+        help="Measures of the regressed functions again (default: 1).",
+    )
+    parser.add_argument(
+        "--update",
+        action="store_true",
+        help="Run the suites and write the baseline file.",
+    )
+    parser.add_argument(
+        "--stub-config",
+        action="append",
+        choices=stubBenchmark.CONFIGS,
+        help="Stub configuration written by --update.",
+    )
+    parser.add_argument(
+        "--stub-variant",
+        action="append",
+        choices=list(stubBenchmark.VARIANTS),
+        help="Stub variant written by --update.",
+    )
+    args = parser.parse_args()
+    suites = args.suite or SUITES
+    # The stub benchmark runs from the root of the repository.
+    args.baseline = str(pathlib.Path(args.baseline).resolve())
+
+    if args.update:
+        baseline = {"python": platform.python_version()}
+        for suite in suites:
+            settings = dict(DEFAULTS[suite])
+            if suite == "stub":
+                settings["configs"] = args.stub_config or settings["configs"]
+                settings["variants"] = args.stub_variant or settings["variants"]
+            baseline[suite] = {
+                "settings": settings,
+                "results": run_suite(suite, settings),
+            }
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump(baseline, file, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    try:
+        with open(args.baseline, "r", encoding="utf-8") as file:
+            baseline = json.load(file)
+    except (OSError, ValueError) as error:
+        print(f"fatal: Cannot read baseline {args.baseline}: {error}")
+        return 1
+
+    regressions = []
+    for suite in suites:
+        if suite not in baseline:
+            print(f"Skip: no '{suite}' results in {args.baseline}.")
+            continue
+        regressions += check_suite(
+            suite, baseline[suite], args.threshold, args.retries
+        )
+
+    if regressions:
+        print(
+            f"\n{len(regressions)} function(s) regressed by more than "
+            f"{args.threshold:.0%} or missing."
+        )
+        return 1
+    print(f"\nNo regression above {args.threshold:.0%}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
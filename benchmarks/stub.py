@@ -0,0 +1,458 @@
+#! /bin/env python
+# Copyright 2025-present, Synopsys, Inc.
+# All rights reserved.
+#
+# This source code is licensed under the GPL-3.0 license found in
+# the LICENSE file in the root directory of this source tree.
+
+"""
+A stand-in for the toolchain and the simulator, used by the benchmarks to
+measure the time spent in `abi-extract-info` itself, see `stubBenchmark.py`.
+
+The "compiler", "assembler" and "linker" (`stub.py tool`) do not generate any
+code: their outputs (assembly, objects and executables) carry the C sources
+they were built from. The "simulator" (`stub.py sim`) recognizes the test
+program in those sources and prints what the real program prints on a RISC-V
+target:
+- the outputs recorded from the real toolchain for the tests whose output does
+  not depend on the generated values (e.g the stack direction);
+- a dump of the registers and the stack, as written by `src/helper.c`, for the
+  tests passing values (argument passing, structs, return values...). The
+  values are placed following a simplified RISC-V calling convention.
+
+The ABI is given by `-mabi=` (see the wrappers in `scripts/wrapper`). The
+environment variables `STUB_VERSION` (version reported by the tools) and
+`STUB_STACK_ENTRIES` (number of stack entries dumped, 32 by default) allow
+benchmarking toolchain upgrades and larger dumps.
+"""
+
+import json
+import os
+import re
+import struct
+import sys
+
+# Prefix of the outputs of the tools.
+MAGIC = "// stub-object"
+# Directive carrying the output of the compiler in an assembly file.
+ASM_PAYLOAD = "\t.stub_payload\t"
+VERSION = os.environ.get("STUB_VERSION", "1.0")
+STACK_ENTRIES = int(os.environ.get("STUB_STACK_ENTRIES", "32"))
+# Sources linked with every test, see `Analyzer.runtime_files`.
+RUNTIME = ("helper.c", "riscv.S", "riscv2.s")
+
+
+# Read an input of a tool, returning the output of the tool it comes from.
+def read_input(path):
+    if path == "-":
+        text = sys.stdin.read()
+    else:
+        with open(path, "r", encoding="utf-8") as file:
+            text = file.read()
+    for line in text.splitlines():
+        if line.startswith(ASM_PAYLOAD):
+            return MAGIC + line[len(ASM_PAYLOAD) :]
+    return text
+
+
+# The sources carried by an input of a tool (or the input itself).
+def read_sources(path, text):
+    if text.startswith(MAGIC):
+        return json.loads(text[len(MAGIC) :])["sources"]
+    return [{"name": os.path.basename(path), "text": text}]
+
+
+# Compile, assemble or link the inputs: the output carries their sources.
+def tool(argv):
+    output = None
+    assembly = False
+    abi = "ilp32d"
+    binary = False
+    inputs = []
+    args = iter(argv)
+    for arg in args:
+        if arg == "-o":
+            output = next(args)
+        elif arg in ("-x", "-I", "-MF"):
+            next(args)
+        elif arg == "-S":
+            assembly = True
+        elif arg == "-DABI_BINARY_DUMP":
+            binary = True
+        elif arg.startswith("-mabi="):
+            abi = arg[len("-mabi=") :]
+        elif arg == "--version":
+            print(f"stub toolchain {VERSION}")
+            return 0
+        elif arg == "-" or not arg.startswith("-"):
+            inputs.append(arg)
+
+    sources = []
+    for path in inputs:
+        text = read_input(path)
+        if text.startswith(MAGIC):
+            content = json.loads(text[len(MAGIC) :])
+            binary = binary or content["binary"]
+        sources += read_sources(path, text)
+    content = json.dumps({"abi": abi, "binary": binary, "sources": sources})
+
+    if assembly:
+        # Like a real compiler, name the source and the toolchain version.
+        content = (
+            f'\t.file\t"{inputs[0] if inputs else "-"}"\n'
+            f"# compiled by stub {VERSION}\n"
+            f"{ASM_PAYLOAD}{content}\n"
+            f'\t.ident\t"stub {VERSION}"\n'
+        )
+    else:
+        content = MAGIC + content
+
+    if output in (None, "-"):
+        sys.stdout.write(content)
+    else:
+        with open(output, "w", encoding="utf-8") as file:
+            file.write(content)
+    return 0
+
+
+# fmt: off
+GPR = [
+    "zero", "ra", "sp", "gp", "tp", "t0", "t1", "t2", "s0", "s1",
+    "a0", "a1", "a2", "a3", "a4", "a5", "a6", "a7", "s2", "s3",
+    "s4", "s5", "s6", "s7", "s8", "s9", "s10", "s11", "t3", "t4",
+    "t5", "t6",
+]
+# fmt: on
+
+
+# Registers and stack of the target, dumped like `src/helper.c` does.
+class Model:
+    def __init__(self, abi, binary=False):
+        self.xlen = 8 if abi.startswith("lp64") else 4
+        self.hard = abi.endswith("d")
+        self.flen = 8 if self.hard else 0
+        self.sp = 0x3FFFFD00 if self.xlen == 8 else 0x407FFE40
+        # The binary dump has a fixed number of stack entries.
+        self.binary = binary
+        self.stack_entries = 32 if binary else STACK_ENTRIES
+        self.case_id = 0
+        # fmt: off
+        self.sizes = {
+            "char": 1, "signed char": 1, "unsigned char": 1, "short": 2,
+            "int": 4, "long": self.xlen, "long long": 8, "void*": self.xlen,
+            "float": 4, "double": 8, "long double": 16,
+        }
+        # fmt: on
+        self.reset()
+
+    def reset(self):
+        self.gpr = [0] * 32
+        self.gpr[1] = 0x10174
+        self.gpr[2] = self.sp
+        self.gpr[3] = 0x1D000
+        self.fpr = [0] * 32
+        self.stack = [0] * self.stack_entries
+
+    def mask(self, size):
+        return (1 << (8 * size)) - 1
+
+    # NaN-boxing of a floating-point value narrower than the registers.
+    def nanbox(self, value, size):
+        if size < 8:
+            return (0xFFFFFFFFFFFFFFFF & ~self.mask(size)) | value
+        return value
+
+    # Sign extension of a value narrower than the registers.
+    def extend(self, value, size, signed):
+        if size < self.xlen and signed and value >> (8 * size - 1):
+            return value | (self.mask(self.xlen) & ~self.mask(size))
+        return value
+
+    # Push a value on the stack, values past the dumped entries are lost.
+    def push(self, position, value):
+        if position < len(self.stack):
+            self.stack[position] = value
+
+    def dump(self):
+        if self.binary:
+            return [self.dump_binary()]
+
+        banks = [("regs_bank0", self.xlen, self.gpr)]
+        if self.hard:
+            banks.append(("regs_bank1", 8, self.fpr))
+        lines = ["// Header info", f"0x{self.sp:x}", f"0x{self.xlen:08x}"]
+        lines.append(f"0x{len(banks):x}")
+        for name, size, registers in banks:
+            lines += [name, f"0x{size:x}", f"0x{len(registers):x}"]
+        for name, _, registers in banks:
+            lines.append(f"// {name}")
+            lines += [f"0x{value:x}" for value in registers]
+        lines.append(f"// Start of stack dump: 0x{self.sp:x}")
+        for index, value in enumerate(self.stack):
+            lines.append(f"0x{self.sp + index * self.xlen:x} : 0x{value:x}")
+        lines.append("// Done")
+        return lines
+
+    # See `dumpInformation.read_binary`.
+    def dump_binary(self):
+        word = "Q" if self.xlen == 8 else "I"
+        banks = [(self.xlen, word, self.gpr)]
+        if self.hard:
+            banks.append((8, "Q", self.fpr))
+        record = struct.pack(
+            "<IIIIQ", 0x444241AB, self.case_id, self.xlen, len(banks), self.sp
+        )
+        for size, _, registers in banks:
+            record += struct.pack("<II", size, len(registers))
+        for size, word_format, registers in banks:
+            record += struct.pack(
+                f"<{len(registers)}{word_format}",
+                *[value & self.mask(size) for value in registers],
+            )
+        record += struct.pack(f"<32{word}", *self.stack)
+        return record + b"\n"
+
+    # Pass scalar arguments.
+    def pass_args(self, args):
+        gpr, fpr, stack = 10, 10, 0
+        for dtype, value in args:
+            size = self.sizes[dtype]
+            if dtype in ("float", "double") and size <= self.flen and fpr < 18:
+                self.fpr[fpr] = self.nanbox(value, size)
+                fpr += 1
+            elif size <= self.xlen:
+                signed = dtype not in ("char", "float", "double")
+                if gpr < 18:
+                    self.gpr[gpr] = self.extend(value, size, signed)
+                    gpr += 1
+                else:
+                    self.push(stack, value)
+                    stack += 1
+            else:
+                low = value & self.mask(self.xlen)
+                high = value >> (8 * self.xlen)
+                if gpr < 17:
+                    self.gpr[gpr], self.gpr[gpr + 1] = low, high
+                    gpr += 2
+                elif gpr == 17:
+                    self.gpr[gpr] = low
+                    self.push(stack, high)
+                    gpr += 1
+                    stack += 1
+                else:
+                    self.push(stack, low)
+                    self.push(stack + 1, high)
+                    stack += 2
+
+    # Offsets of the members of a struct, and its size.
+    def layout(self, dtypes):
+        offset, align, offsets = 0, 1, []
+        for dtype in dtypes:
+            size = self.sizes[dtype]
+            offset = (offset + size - 1) // size * size
+            offsets.append(offset)
+            offset += size
+            align = max(align, size)
+        return offsets, (offset + align - 1) // align * align
+
+    # Pass a struct argument. Returns its size.
+    def pass_struct(self, dtypes, values):
+        offsets, size = self.layout(dtypes)
+        floats = [dtype in ("float", "double") for dtype in dtypes]
+        if self.hard and any(floats) and len(dtypes) <= 2:
+            gpr, fpr = 10, 10
+            for dtype, value in zip(dtypes, values):
+                if dtype in ("float", "double"):
+                    self.fpr[fpr] = self.nanbox(value, self.sizes[dtype])
+                    fpr += 1
+                else:
+                    self.gpr[gpr] = value
+                    gpr += 1
+            return size
+
+        memory = 0
+        for offset, value in zip(offsets, values):
+            memory |= value << (8 * offset)
+        words = [
+            (memory >> (8 * self.xlen * index)) & self.mask(self.xlen)
+            for index in range((size + self.xlen - 1) // self.xlen)
+        ]
+        if size <= 2 * self.xlen:
+            for index, word in enumerate(words):
+                self.gpr[10 + index] = word
+        else:
+            # Passed by reference, to a copy on the stack.
+            base = 16
+            for index, word in enumerate(words):
+                self.push(base + index, word)
+            self.gpr[10] = self.sp + base * self.xlen
+        return size
+
+
+def hexes(text):
+    return [int(value, 16) for value in re.findall(r"0x[0-9a-fA-F]+", text)]
+
+
+def run_datatypes(model, text):
+    lines = []
+    signed = {"signed char", "short", "int", "long", "long long"}
+    signed |= {"float", "double", "long double"}
+    for name in re.findall(r'print_info\("([^"]+)"', text):
+        dtype = name
+        if name.startswith(("struct", "union")):
+            dtype = name.split(" ", 1)[1].replace("_", " ")
+            dtype = dtype.replace("void", "void*")
+        size = model.sizes.get(dtype, 4)
+        signedness = 1 if name in signed else 0
+        lines.append(
+            f"{name:<20}: signedness: {signedness}, size: {size}, "
+            f"align: {size}"
+        )
+    return lines
+
+
+def run_argpass(model, text):
+    prototype = re.search(r"extern void callee\(([^)]*)\);", text).group(1)
+    dtypes = [dtype.strip() for dtype in prototype.split(",")]
+    call = re.search(r"callee\((.*)\);\s*}", text, re.S).group(1)
+    model.pass_args(list(zip(dtypes, hexes(call))))
+    return model.dump()
+
+
+def run_struct(model, text):
+    members = re.search(r"struct structType \{(.*?)\};", text, re.S).group(1)
+    dtypes = [m.strip() for m in re.findall(r"\s*([\w ]+?) a\d+;", members)]
+    values = re.search(r"\} u = \{(.*?)\};", text, re.S).group(1)
+    values = [int(v, 16) for v in re.findall(r"= (0x[0-9a-fA-F]+)", values)]
+    size = model.pass_struct(dtypes, values)
+    return [f"Sizeof(struct structType): {size}"] + model.dump()
+
+
+def run_return(model, text):
+    match = re.search(
+        r"\n([\w ]+?) bar \(void\) \{.*?return (.*?);", text, re.S
+    )
+    dtype, value = match.group(1).strip(), hexes(match.group(2))[0]
+    size = model.sizes[dtype]
+    if dtype in ("float", "double") and model.hard:
+        model.fpr[10] = model.nanbox(value, size)
+    elif size <= model.xlen:
+        model.gpr[10] = model.extend(value, size, dtype != "char")
+    else:
+        model.gpr[10] = value & model.mask(model.xlen)
+        model.gpr[11] = value >> (8 * model.xlen)
+    return model.dump()
+
+
+def run_saved(model, text):
+    caller = re.search(r"main \(void\) \{\s*set_registers\((.*?)\)", text, re.S)
+    callee = re.search(r"aux \(void\) \{.*?set_registers\((.*?)\)", text, re.S)
+    caller, callee = hexes(caller.group(1))[0], hexes(callee.group(1))[0]
+    for index in range(5, 32):
+        saved = GPR[index].startswith("s")
+        model.gpr[index] = caller if saved else callee
+    return model.dump()
+
+
+def run_empty_struct(model, text):
+    lines = []
+    for call in re.findall(r"    callee\(([^)]+)\);", text):
+        model.reset()
+        args = [arg.strip() for arg in call.split(",")]
+        for index in range(args.count("I")):
+            model.gpr[10 + index] = 0xDEAD
+        lines += model.dump()
+    return lines
+
+
+def run_bitfield(model, text):
+    lines = []
+    for name, sign in re.findall(r'printf\("(\w+):([<>]):"\);', text):
+        padding = "Extra padding." if sign == ">" else "No extra padding."
+        lines.append(f"{name}:{sign}:{padding}:Little-endian.")
+    return lines
+
+
+# Outputs recorded from the real toolchain, for the tests whose output does
+# not depend on the generated values.
+RECORDED = {
+    "Stack direction test": [
+        "Stack direction test:",
+        "- The stack grows downwards.",
+    ],
+    "Stack alignment test": [
+        "Stack alignment test:",
+        "- Number of least significant 0 bits: 4",
+        "- Stack is aligned to 16 bytes.",
+    ],
+    "Endianess test": [
+        "Endianess test:",
+        "- Wrote (as ull):  0123456789abcdef",
+        "- Read  (as char): efcdab8967452301",
+        "- This system is little-endian.",
+    ],
+}
+
+
+# The stdout of the test program of `text`, as a list of lines.
+def run_program(model, text):
+    model.reset()
+    if "print_info(" in text:
+        return run_datatypes(model, text)
+    for marker, lines in RECORDED.items():
+        if marker in text:
+            return lines
+    if "union union_" in text and "calculate_" in text:
+        return run_bitfield(model, text)
+    if "aux (void)" in text and "set_registers(" in text:
+        return run_saved(model, text)
+    if "bar (void)" in text:
+        return run_return(model, text)
+    if "struct emptyStruct" in text:
+        return run_empty_struct(model, text)
+    if "struct structType" in text:
+        return run_struct(model, text)
+    if "extern void callee(" in text:
+        return run_argpass(model, text)
+    return []
+
+
+# Simulate the executable `argv[-1]`.
+def sim(argv):
+    if "--version" in argv:
+        print(f"stub simulator {VERSION}")
+        return 0
+    with open(argv[-1], "r", encoding="utf-8") as file:
+        content = json.loads(file.read()[len(MAGIC) :])
+    model = Model(content["abi"], content["binary"])
+    sources = [
+        source["text"]
+        for source in content["sources"]
+        if not source["name"].endswith(RUNTIME)
+    ]
+
+    # Test cases built into a single program, see `caseBatch.py`.
+    cases = {}
+    for source in sources:
+        match = re.match(r"#define main abi_case_(\d+)_main\n", source)
+        if match:
+            cases[int(match.group(1))] = source
+    if cases:
+        lines = []
+        for index in sorted(cases):
+            lines.append(f"// Case {index}")
+            model.case_id = index
+            lines += run_program(model, cases[index])
+    else:
+        lines = run_program(model, "\n".join(sources))
+
+    for line in lines:
+        sys.stdout.buffer.write(
+            line if isinstance(line, bytes) else (line + "\n").encode()
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    mode = sys.argv[1]
+    sys.exit(tool(sys.argv[2:]) if mode == "tool" else sim(sys.argv[2:]))
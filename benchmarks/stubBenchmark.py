@@ -0,0 +1,284 @@
+#! /bin/env python
+# Copyright 2025-present, Synopsys, Inc.
+# All rights reserved.
+#
+# This source code is licensed under the GPL-3.0 license found in
+# the LICENSE file in the root directory of this source tree.
+
+"""
+Measures how much of a run of `abi-extract-info` is spent in the tool itself,
+rather than in the toolchain and the simulator.
+
+The analyzers are run by `__main__.run_analyzers` with the stub toolchain of
+`scripts/wrapper` (see `stub.py`), whose tools return at once. Each run
+reports:
+- its wall time, and the wall time of each analyzer (analyzers running
+  concurrently with `--jobs` overlap);
+- the CPU time of the tool (`self_cpu`) and of the processes it spawned
+  (`children_cpu`, i.e the stub tools).
+
+The runs are repeated for each stub configuration and each variant, the
+variants scaling up the work of the analyzers (see `VARIANTS`):
+```
+$ python3 benchmarks/stubBenchmark.py --variant default --variant argc
+$ python3 benchmarks/stubBenchmark.py --repeat 5 --output timings.json
+```
+
+The timings are written as JSON (the best run of each variant, along with
+every run), to be tracked over time.
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import json
+import os
+import pathlib
+import platform
+import resource
+import statistics
+import sys
+import time
+
+BENCHMARKS = pathlib.Path(__file__).resolve().parent
+ROOT = BENCHMARKS.parent
+sys.path.insert(0, str(ROOT / "abi-extract-info"))
+
+import analyzer
+import compilationDriver
+import reportDriver
+import targetArch
+from analyzers.argpass import ArgPassAnalyzer
+from analyzers.returnpass import ReturnAnalyzer
+
+# The wrappers of the stub toolchain, see `stub.py`.
+WRAPPERS = BENCHMARKS / "scripts" / "wrapper"
+CONFIGS = ["stub-rv32gc-ilp32d", "stub-rv32gc-ilp32", "stub-rv64gc-lp64d"]
+
+# Datatypes tested by default, and by the "dtypes" variant.
+DTYPES = ["char", "short", "int", "long", "long long", "float", "double"]
+MORE_DTYPES = DTYPES + ["signed char", "unsigned char", "long double"]
+# The values of a batch are unique, and there are only 225 `char` values (see
+# `helper.ValueGenerator`), i.e up to 21 arguments.
+WIDE_DTYPES = DTYPES[1:]
+
+# Variant -> options of the driver, and settings of the analyzers and the
+# stub: datatypes tested, maximum argument count of the batched sweep and
+# number of stack entries dumped.
+# fmt: off
+VARIANTS = {
+    "default": {},
+    "batch":   {"batch": True},
+    "binary":  {"batch": True, "binary_dump": True},
+    "dtypes":  {"batch": True, "dtypes": MORE_DTYPES},
+    "argc":    {"batch": True, "dtypes": WIDE_DTYPES, "max_argc": 80,
+                "stack_entries": 128},
+    "stack":   {"stack_entries": 256},
+}
+# fmt: on
+
+
+# Load `__main__.py` of the tool as a module, without running it.
+def load_main():
+    spec = importlib.util.spec_from_file_location(
+        "abi_extract_info_main", ROOT / "abi-extract-info" / "__main__.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# Wraps `Analyzer.execute` to record the wall time of each analyzer.
+class AnalyzerTimer:
+    def __init__(self):
+        self.timings = {}
+        self.execute = analyzer.Analyzer.execute
+
+    def __enter__(self):
+        timer = self
+
+        def execute(self):
+            start = time.perf_counter()
+            try:
+                return timer.execute(self)
+            finally:
+                timer.timings[self.name] = time.perf_counter() - start
+
+        analyzer.Analyzer.execute = execute
+        return self
+
+    def __exit__(self, *args):
+        analyzer.Analyzer.execute = self.execute
+
+
+# Apply the settings of a variant to the analyzers and the stub, restoring
+# them afterwards.
+class VariantSettings:
+    def __init__(self, variant):
+        self.variant = variant
+
+    def __enter__(self):
+        self.saved = (
+            ArgPassAnalyzer.dtypes,
+            ReturnAnalyzer.dtypes,
+            ArgPassAnalyzer.max_argc,
+            os.environ.get("STUB_STACK_ENTRIES"),
+        )
+        dtypes = self.variant.get("dtypes", DTYPES)
+        ArgPassAnalyzer.dtypes = ReturnAnalyzer.dtypes = dtypes
+        ArgPassAnalyzer.max_argc = self.variant.get(
+            "max_argc", ArgPassAnalyzer.max_argc
+        )
+        os.environ["STUB_STACK_ENTRIES"] = str(
+            self.variant.get("stack_entries", 32)
+        )
+        return self
+
+    def __exit__(self, *args):
+        (
+            ArgPassAnalyzer.dtypes,
+            ReturnAnalyzer.dtypes,
+            ArgPassAnalyzer.max_argc,
+            stack_entries,
+        ) = self.saved
+        if stack_entries is None:
+            os.environ.pop("STUB_STACK_ENTRIES", None)
+        else:
+            os.environ["STUB_STACK_ENTRIES"] = stack_entries
+
+
+def cpu_times():
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return (
+        own.ru_utime + own.ru_stime,
+        children.ru_utime + children.ru_stime,
+    )
+
+
+# Run every analyzer once with the stub configuration `config`.
+def run(main, config, variant, jobs, seed):
+    Report = reportDriver.ReportDriver(None, None)
+    Driver = compilationDriver.CompilationDriver(
+        False,
+        WRAPPERS / "cc" / config,
+        WRAPPERS / "sim" / "stub",
+        jobs=jobs,
+        batch=variant.get("batch", False),
+        binary_dump=variant.get("binary_dump", False),
+        seed=seed,
+    )
+    try:
+        # Keep the messages of the tool out of the timings written to stdout.
+        with contextlib.redirect_stdout(sys.stderr):
+            with VariantSettings(variant), AnalyzerTimer() as timer:
+                self_start, children_start = cpu_times()
+                start = time.perf_counter()
+                main.run_analyzers(Driver, Report, targetArch.RISCV(), jobs)
+                wall = time.perf_counter() - start
+                self_end, children_end = cpu_times()
+    finally:
+        Driver.close()
+
+    return {
+        "wall": wall,
+        "self_cpu": self_end - self_start,
+        "children_cpu": children_end - children_start,
+        "analyzers": timer.timings,
+        "sections": len(Report.Files),
+    }
+
+
+# Summary of the runs of a variant: the best run, and the median wall time.
+def summarize(config, name, runs):
+    best = min(runs, key=lambda result: result["wall"])
+    return {
+        "config": config,
+        "variant": name,
+        "wall": best["wall"],
+        "wall_median": statistics.median(run["wall"] for run in runs),
+        "self_cpu": best["self_cpu"],
+        "children_cpu": best["children_cpu"],
+        "analyzers": best["analyzers"],
+        "sections": best["sections"],
+        "runs": runs,
+    }
+
+
+# Run the variants `variants` of every stub configuration of `configs`,
+# `repeat` times each. Returns the summary of each variant.
+def run_all(configs, variants, repeat, jobs, seed):
+    # The analyzers find their sources relative to the root of the repository.
+    os.chdir(ROOT)
+    main = load_main()
+
+    results = []
+    for config in configs:
+        for name in variants:
+            runs = [
+                run(main, config, VARIANTS[name], jobs, seed)
+                for _ in range(repeat)
+            ]
+            result = summarize(config, name, runs)
+            results.append(result)
+            print(
+                f"{config:<20} {name:<8} wall {result['wall']:7.3f}s"
+                f"  self {result['self_cpu']:7.3f}s"
+                f"  children {result['children_cpu']:7.3f}s",
+                file=sys.stderr,
+            )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Time the analyzers with the stub toolchain."
+    )
+    parser.add_argument(
+        "--config",
+        action="append",
+        choices=CONFIGS,
+        help="Stub configuration to run (default: all).",
+    )
+    parser.add_argument(
+        "--variant",
+        action="append",
+        choices=list(VARIANTS),
+        help="Variant to run (default: all).",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Runs of each variant."
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=1, help="Jobs of the driver."
+    )
+    parser.add_argument(
+        "--seed", type=int, default=0, help="Seed of the test values."
+    )
+    parser.add_argument("--output", help="Write the timings to this file.")
+    args = parser.parse_args()
+
+    output = {
+        "benchmark": "stub",
+        "python": platform.python_version(),
+        "jobs": args.jobs,
+        "repeat": args.repeat,
+        "seed": args.seed,
+        "results": run_all(
+            args.config or CONFIGS,
+            args.variant or list(VARIANTS),
+            args.repeat,
+            args.jobs,
+            args.seed,
+        ),
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(output, file, indent=2)
+    else:
+        json.dump(output, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -26,6 +26,51 @@ extern uint64_t regs_bank1[32];
 
 #define ARRAY_LENGTH(x) sizeof(x)/sizeof(x[0])
 
+#ifndef __riscv_float_abi_soft
+#define REGISTER_BANK_COUNT 2
+#else
+#define REGISTER_BANK_COUNT 1
+#endif
+
+// Identifier of the running test case, set by the dispatcher of a batch.
+unsigned abi_case_id = 0;
+
+#ifdef ABI_BINARY_DUMP
+// Binary dump record, decoded by "dumpInformation.py":
+//   magic, case id, size of stack entry, number of register banks (uint32_t)
+//   current stack (uint64_t)
+//   foreach register bank: size of register, number of registers (uint32_t)
+//   foreach register bank: the raw registers
+//   stack: 32 raw entries
+//   '\n'
+#define ABI_DUMP_MAGIC 0x444241abu
+
+static void dump_bank_info(uint32_t size, uint32_t count) {
+    uint32_t info[2] = {size, count};
+    fwrite(info, sizeof(info), 1, stdout);
+}
+
+void dump_information(REGISTER_WORD* Stack) {
+    uint32_t header[4] = {ABI_DUMP_MAGIC, abi_case_id, sizeof(Stack[0]),
+                          REGISTER_BANK_COUNT};
+    uint64_t stack_ptr = (uintptr_t)Stack;
+    fwrite(header, sizeof(header), 1, stdout);
+    fwrite(&stack_ptr, sizeof(stack_ptr), 1, stdout);
+
+    dump_bank_info(sizeof(regs_bank0[0]), ARRAY_LENGTH(regs_bank0));
+#ifndef __riscv_float_abi_soft
+    dump_bank_info(sizeof(regs_bank1[0]), ARRAY_LENGTH(regs_bank1));
+#endif
+
+    fwrite(regs_bank0, sizeof(regs_bank0), 1, stdout);
+#ifndef __riscv_float_abi_soft
+    fwrite(regs_bank1, sizeof(regs_bank1), 1, stdout);
+#endif
+    fwrite(Stack, sizeof(Stack[0]), 32, stdout);
+    // End the line, the record is surrounded by the text of the test.
+    putchar('\n');
+}
+#else
 void dump_information(REGISTER_WORD* Stack) {
     // current stack
     // sizeof pointer (aka register)
@@ -69,3 +114,4 @@ void dump_information(REGISTER_WORD* Stack) {
     }
     printf("// Done\n");
 }
+#endif